@@ -11,21 +11,99 @@ from tkinter import ttk, messagebox, scrolledtext, filedialog, simpledialog
 import threading
 import json
 import os
+import hashlib
+import shutil
+import re
+import time
 from datetime import datetime, timedelta
 import webbrowser
 import socket
+import selectors
+import errno
+from collections import deque
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 # Try to import requests
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     HAS_REQUESTS = True
 except ImportError:
     import urllib.request
     import urllib.error
+    import urllib.parse
     HAS_REQUESTS = False
 
+# Optional incremental JSON parser for large /sessions responses
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# Theme colors
+COLORS = {
+    "bg": "#0f0f1a",
+    "bg_secondary": "#1a1a2e",
+    "fg": "#ffffff",
+    "muted": "#a0a0b0",
+    "accent": "#6366f1",
+    "accent_hover": "#818cf8",
+    "success": "#10b981",
+    "warning": "#f59e0b",
+    "danger": "#ef4444",
+    "card_bg": "#252542",
+    "border": "#3f3f5a"
+}
+
+# Saved admin settings
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "admin_config.json")
+
+# API tab responses larger than this are streamed into the text box as raw text
+STREAM_RESPONSE_BYTES = 64 * 1024
+
+# Fallback row height for the sessions list until a real row can be measured
+SESSION_ROW_HEIGHT = 20
+
+# Sessions fetched per page; "Load more" raises the limit by another page
+SESSIONS_PAGE = 200
+
+# Identical GETs within this many seconds share one response (coalesces bursts)
+GET_CACHE_TTL = 1.0
+GET_CACHE_SIZE = 64
+
+# Log widgets keep at most this many lines; trimmed once they overshoot by LOG_TRIM_SLACK
+MAX_LOG_LINES = 2000
+LOG_TRIM_SLACK = 200
+ACTIVITY_LOG_LINES = 500
+
+# Tools tab cards: (glyph, title, description, AdminPanel method name)
+TOOLS = (
+    ("💾", "Backup Database", "Create full backup", "backup_database"),
+    ("📥", "Restore Backup", "Restore from file", "restore_backup"),
+    ("🧹", "Clear Sessions", "Delete all sessions", "clear_all_sessions"),
+    ("📊", "Export Analytics", "Download report", "export_analytics"),
+    ("🔄", "Restart Server", "Restart backend", "restart_server"),
+    ("📝", "View Server Logs", "Check logs", "view_server_logs"),
+    ("🔌", "Check Ports", "Port scanner", "check_ports"),
+    ("🌐", "Network Info", "Connection details", "show_network_info"),
+)
+
+# Messages chart: bar rows, cells indexed by how many half-rows of a bar fall
+# in that row, and the x axis under the 7 day columns
+CHART_ROWS = 10
+BAR_GLYPHS = ("   ", " ▄ ", " █ ")
+CHART_AXIS = "    +" + "---" * 7
+
+# How often the cached local IP is re-resolved in the background
+LOCAL_IP_REFRESH_MS = 5 * 60 * 1000
+
 
 class AdminPanel:
+    # Tcl interpreter whose ttk theme/styles are already configured
+    _styled_interp = None
+    
     def __init__(self, root):
         self.root = root
         self.root.title("🛡️ Nao AI Admin Panel - Commercial Edition")
@@ -45,27 +123,43 @@ class AdminPanel:
         }
         
         # Load saved config
+        self._config_hash = None  # sha1 of the config file as last read/written
         self.load_config()
         
+        # Shared HTTP client - keeps connections to the API alive between polls
+        self.session = None
+        self._opener = None
+        if HAS_REQUESTS:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            if self.config["api_key"]:
+                self.session.headers.update({"X-Admin-Key": self.config["api_key"]})
+        
+        # Worker pool for network calls - keeps the Tk main loop responsive
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="adminhttp")
+        self._config_lock = threading.Lock()
+        self._get_cache = {}  # endpoint -> (expires at, response), see api_request
+        self._get_cache_lock = threading.Lock()
+        self._config_version = 0   # bumped per save_config call
+        self._config_written = 0   # newest version on disk
+        
+        # Live updates (see auto_refresh)
+        self._stop_event = threading.Event()
+        self._window_shown = threading.Event()  # cleared while the window is minimized
+        self._window_shown.set()
+        self._events_supported = HAS_REQUESTS
+        self._etag = None
+        
         # Verify PIN at startup
         self.root.withdraw() # Hide window
         if not self.verify_login():
-            self.root.destroy()
+            self.close()
             sys.exit(0)
         self.root.deiconify() # Show window
-            
-    def verify_login(self):
-        """Show login dialog"""
-        while True:
-            pin = simpledialog.askstring("Admin Login", "Enter Admin PIN:", show="*", parent=self.root)
-            if pin is None: # Cancel
-                return False
-            
-            if pin == self.config.get("admin_pin", "2010"):
-                return True
-            else:
-                messagebox.showerror("Access Denied", "Invalid PIN")
-            
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
         # Stats
         self.stats = {
             "total_requests": 0,
@@ -75,6 +169,44 @@ class AdminPanel:
             "status": "Disconnected"
         }
         
+        # Sessions list model - only the rows in view live in the Treeview
+        self._all_sessions = []       # (values, search key) per loaded session
+        self._filtered_sessions = []  # indexes into _all_sessions matching the search
+        self._window_first = 0
+        self._window_size = 20
+        self._sessions_limit = SESSIONS_PAGE
+        self._sessions_gen = 0  # bumped per load; results from older loads are dropped
+        self._filter_after_id = None
+        self._reload_after_id = None  # pending server reload while typing into an empty list
+        self._filter_text = None
+        self._filter_re = None
+        
+        # Last chart data, kept so the analytics tab can draw it when first opened
+        self._daily_messages = []
+        self._chart_sig = None  # (values, days) currently drawn in messages_chart
+        
+        # Log timestamp format (time.strftime avoids a datetime allocation per line)
+        self._ts_fmt = "%Y-%m-%d %H:%M:%S"
+        self._ts_cache = (None, "")  # (whole second, formatted timestamp)
+        self._accessed_at = self.get_timestamp()
+        
+        # Scrollable canvases: pending scrollregion updates and last applied bbox
+        self._sr_pending = set()
+        self._sr_last = {}
+        
+        # Activity log lines not yet shown, appended to the widget once per idle pass
+        self._log_queue = deque(maxlen=ACTIVITY_LOG_LINES)
+        self._log_flush_scheduled = False
+        
+        # Pending lines for the security/tools logs, written in one insert per flush
+        self._log_buffers = {"security_log": [], "tools_log": []}
+        self._log_pending = False
+        
+        # Local IP, resolved off the UI thread (see refresh_local_ip)
+        self._local_ip = None
+        self._local_ip_lock = threading.Lock()
+        self.refresh_local_ip()
+        
         # Create main interface
         self.setup_styles()
         self.create_widgets()
@@ -82,38 +214,80 @@ class AdminPanel:
         # Start auto-refresh
         self.auto_refresh()
         
+    def verify_login(self):
+        """Show login dialog"""
+        while True:
+            pin = simpledialog.askstring("Admin Login", "Enter Admin PIN:", show="*", parent=self.root)
+            if pin is None: # Cancel
+                return False
+            
+            if pin == self.config.get("admin_pin", "2010"):
+                return True
+            else:
+                messagebox.showerror("Access Denied", "Invalid PIN")
+    
+    def close(self):
+        """Release network resources and close the window"""
+        self._stop_event.set()
+        # A config write still queued would be cancelled below - write the latest now
+        if self._config_written < self._config_version:
+            try:
+                self._write_config(dict(self.config), self._config_version)
+            except OSError as e:
+                self.on_config_error(e)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.session is not None:
+            self.session.close()
+        self.root.destroy()
+        
     def setup_styles(self):
         """Setup modern styling"""
-        style = ttk.Style()
-        style.theme_use('clam')
+        # Colors - c_<name> attributes save a dict lookup per widget built
+        for name, value in COLORS.items():
+            setattr(self, f"c_{name}", value)
+        self.root.configure(bg=self.c_bg)
         
-        # Colors
-        self.colors = {
-            "bg": "#0f0f1a",
-            "bg_secondary": "#1a1a2e",
-            "fg": "#ffffff",
-            "accent": "#6366f1",
-            "accent_hover": "#818cf8",
-            "success": "#10b981",
-            "warning": "#f59e0b",
-            "danger": "#ef4444",
-            "card_bg": "#252542",
-            "border": "#3f3f5a"
-        }
+        # Theme and named styles live in the Tcl interpreter - a re-opened panel reuses them
+        if AdminPanel._styled_interp is self.root.tk:
+            return
         
-        self.root.configure(bg=self.colors["bg"])
+        style = ttk.Style(self.root)
+        style.theme_use('clam')
+        card_bg = COLORS["card_bg"]
+        
+        # Named card styles - widgets reference these instead of passing bg/fg/font each
+        style.configure("Card.TFrame", background=card_bg)
+        style.configure("Card.TLabel", background=card_bg, foreground=COLORS["fg"],
+                        font=("Segoe UI", 10))
+        style.configure("CardTitle.TLabel", background=card_bg, foreground=COLORS["fg"],
+                        font=("Segoe UI", 11, "bold"))
+        style.configure("CardMuted.TLabel", background=card_bg, foreground=COLORS["muted"],
+                        font=("Segoe UI", 9))
+        style.configure("CardIcon.TLabel", background=card_bg, foreground=COLORS["accent"],
+                        font=("Segoe UI", 16))
+        style.configure("CardGlyph.TLabel", background=card_bg, foreground=COLORS["accent"],
+                        font=("Segoe UI", 24))
+        style.configure("CardValue.TLabel", background=card_bg, foreground=COLORS["accent"],
+                        font=("Segoe UI", 10, "bold"))
+        style.configure("Stat.TLabel", background=card_bg, foreground=COLORS["accent"],
+                        font=("Segoe UI", 24, "bold"))
+        for name in ("accent", "success", "warning", "danger"):
+            style.configure(f"{name.title()}.Metric.TLabel", background=card_bg,
+                            foreground=COLORS[name], font=("Segoe UI", 22, "bold"))
+        
+        AdminPanel._styled_interp = self.root.tk
         
     def create_widgets(self):
         """Create the main interface"""
         # Main container with sidebar
-        main_container = tk.Frame(self.root, bg=self.colors["bg"])
+        main_container = tk.Frame(self.root, bg=self.c_bg)
         main_container.pack(fill=tk.BOTH, expand=True)
         
         # Sidebar
         self.create_sidebar(main_container)
         
         # Content area
-        self.content_frame = tk.Frame(main_container, bg=self.colors["bg"])
+        self.content_frame = tk.Frame(main_container, bg=self.c_bg)
         self.content_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Header
@@ -123,26 +297,56 @@ class AdminPanel:
         self.notebook = ttk.Notebook(self.content_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Create all tabs
-        self.create_dashboard_tab()
-        self.create_sessions_tab()
-        self.create_users_tab()
-        self.create_analytics_tab()
-        self.create_models_tab()
-        self.create_settings_tab()
-        self.create_api_tab()
-        self.create_security_tab()
-        self.create_tools_tab()
+        # Tabs start as empty frames and are built on first view (see build_tab)
+        self._tab_builders = [
+            ("📊 Dashboard", self.create_dashboard_tab),
+            ("💬 Sessions", self.create_sessions_tab),
+            ("👥 Users", self.create_users_tab),
+            ("📈 Analytics", self.create_analytics_tab),
+            ("🤖 Models", self.create_models_tab),
+            ("⚙️ Settings", self.create_settings_tab),
+            ("🔌 API", self.create_api_tab),
+            ("🔐 Security", self.create_security_tab),
+            ("🛠️ Tools", self.create_tools_tab),
+        ]
+        self._tab_frames = []
+        self._built_tabs = set()
+        for title, _ in self._tab_builders:
+            frame = tk.Frame(self.notebook, bg=self.c_bg)
+            self.notebook.add(frame, text=title)
+            self._tab_frames.append(frame)
+        
+        self.notebook.bind("<<NotebookTabChanged>>", self._ensure_tab_built)
+        self.build_tab(0)
+        
+    def build_tab(self, index):
+        """Build a tab's widgets the first time it is needed"""
+        if index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+        frame = self._tab_frames[index]
+        for child in frame.winfo_children():
+            child.destroy()
+        self._tab_builders[index][1](frame)
+    
+    def _ensure_tab_built(self, event=None):
+        """Build the newly selected tab"""
+        self.build_tab(self.notebook.index("current"))
+    
+    def select_tab(self, index):
+        """Build (if needed) and show a tab"""
+        self.build_tab(index)
+        self.notebook.select(index)
         
     def create_sidebar(self, parent):
         """Create sidebar navigation"""
-        sidebar = tk.Frame(parent, bg=self.colors["bg_secondary"], width=60)
+        sidebar = tk.Frame(parent, bg=self.c_bg_secondary, width=60)
         sidebar.pack(side=tk.LEFT, fill=tk.Y)
         sidebar.pack_propagate(False)
         
         # Logo
         logo = tk.Label(sidebar, text="🤖", font=("Segoe UI", 24), 
-                       bg=self.colors["bg_secondary"], fg=self.colors["accent"])
+                       bg=self.c_bg_secondary, fg=self.c_accent)
         logo.pack(pady=20)
         
         # Nav buttons
@@ -160,65 +364,63 @@ class AdminPanel:
         
         for icon, tooltip, tab_index in nav_items:
             btn = tk.Button(sidebar, text=icon, font=("Segoe UI", 16),
-                           bg=self.colors["bg_secondary"], fg=self.colors["fg"],
+                           bg=self.c_bg_secondary, fg=self.c_fg,
                            relief=tk.FLAT, cursor="hand2", width=3, height=1,
-                           command=lambda i=tab_index: self.notebook.select(i))
+                           command=partial(self.select_tab, tab_index))
             btn.pack(pady=5)
             self.create_tooltip(btn, tooltip)
         
         # Bottom - Status indicator
         self.sidebar_status = tk.Label(sidebar, text="●", font=("Segoe UI", 16),
-                                       bg=self.colors["bg_secondary"], 
-                                       fg=self.colors["danger"])
+                                       bg=self.c_bg_secondary, 
+                                       fg=self.c_danger)
         self.sidebar_status.pack(side=tk.BOTTOM, pady=20)
         
     def create_header(self):
         """Create header with status"""
-        header = tk.Frame(self.content_frame, bg=self.colors["bg"], height=60)
+        header = tk.Frame(self.content_frame, bg=self.c_bg, height=60)
         header.pack(fill=tk.X, padx=10, pady=10)
         
         # Title
         title = tk.Label(header, text="Admin Control Panel", 
                         font=("Segoe UI", 20, "bold"),
-                        bg=self.colors["bg"], fg=self.colors["fg"])
+                        bg=self.c_bg, fg=self.c_fg)
         title.pack(side=tk.LEFT)
         
         # Status & Quick actions
-        actions_frame = tk.Frame(header, bg=self.colors["bg"])
+        actions_frame = tk.Frame(header, bg=self.c_bg)
         actions_frame.pack(side=tk.RIGHT)
         
         # Connection status
         self.status_label = tk.Label(actions_frame, text="● Disconnected", 
-                                     fg=self.colors["danger"],
-                                     bg=self.colors["bg"], font=("Segoe UI", 11))
+                                     fg=self.c_danger,
+                                     bg=self.c_bg, font=("Segoe UI", 11))
         self.status_label.pack(side=tk.LEFT, padx=10)
         
         # Quick buttons
         refresh_btn = tk.Button(actions_frame, text="🔄 Refresh", 
                                command=self.refresh_all,
-                               bg=self.colors["card_bg"], fg=self.colors["fg"],
+                               bg=self.c_card_bg, fg=self.c_fg,
                                relief=tk.FLAT, cursor="hand2", padx=10)
         refresh_btn.pack(side=tk.LEFT, padx=5)
         
         website_btn = tk.Button(actions_frame, text="🌐 Open Site",
                                command=self.open_website,
-                               bg=self.colors["card_bg"], fg=self.colors["fg"],
+                               bg=self.c_card_bg, fg=self.c_fg,
                                relief=tk.FLAT, cursor="hand2", padx=10)
         website_btn.pack(side=tk.LEFT, padx=5)
         
-    def create_dashboard_tab(self):
+    def create_dashboard_tab(self, tab):
         """Dashboard with comprehensive stats"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="📊 Dashboard")
         
         # Scrollable container
-        canvas = tk.Canvas(tab, bg=self.colors["bg"], highlightthickness=0)
+        canvas = tk.Canvas(tab, bg=self.c_bg, highlightthickness=0)
         scrollbar = ttk.Scrollbar(tab, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors["bg"])
+        scrollable_frame = tk.Frame(canvas, bg=self.c_bg)
         
         scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            lambda e: self._queue_scrollregion_update(canvas)
         )
         
         canvas_frame = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
@@ -236,14 +438,14 @@ class AdminPanel:
         parent = scrollable_frame
         
         # Stats cards row 1
-        stats_frame1 = tk.Frame(parent, bg=self.colors["bg"])
+        stats_frame1 = tk.Frame(parent, bg=self.c_bg)
         stats_frame1.pack(fill=tk.X, pady=10, padx=10)
         
         stats_row1 = [
-            ("status", "Server Status", "Checking...", self.colors["accent"]),
-            ("sessions", "Active Sessions", "0", self.colors["success"]),
-            ("messages", "Total Messages", "0", self.colors["warning"]),
-            ("uptime", "Server Uptime", "0m", self.colors["accent"]),
+            ("status", "Server Status", "Checking...", "accent"),
+            ("sessions", "Active Sessions", "0", "success"),
+            ("messages", "Total Messages", "0", "warning"),
+            ("uptime", "Server Uptime", "0m", "accent"),
         ]
         
         self.stat_labels = {}
@@ -253,14 +455,14 @@ class AdminPanel:
             stats_frame1.columnconfigure(i, weight=1)
         
         # Stats cards row 2
-        stats_frame2 = tk.Frame(parent, bg=self.colors["bg"])
+        stats_frame2 = tk.Frame(parent, bg=self.c_bg)
         stats_frame2.pack(fill=tk.X, pady=5, padx=10)
         
         stats_row2 = [
-            ("requests", "API Requests", "0", self.colors["success"]),
-            ("errors", "Errors Today", "0", self.colors["danger"]),
-            ("avg_response", "Avg Response", "0ms", self.colors["warning"]),
-            ("model", "Active Model", "Nemotron", self.colors["accent"]),
+            ("requests", "API Requests", "0", "success"),
+            ("errors", "Errors Today", "0", "danger"),
+            ("avg_response", "Avg Response", "0ms", "warning"),
+            ("model", "Active Model", "Nemotron", "accent"),
         ]
         
         for i, (key, label, value, color) in enumerate(stats_row2):
@@ -269,25 +471,26 @@ class AdminPanel:
             stats_frame2.columnconfigure(i, weight=1)
         
         # Two column layout
-        columns_frame = tk.Frame(parent, bg=self.colors["bg"])
+        columns_frame = tk.Frame(parent, bg=self.c_bg)
         columns_frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=10)
         
         # Left column - Recent activity
         left_col = tk.LabelFrame(columns_frame, text=" Recent Activity ",
-                                bg=self.colors["bg"], fg=self.colors["fg"],
+                                bg=self.c_bg, fg=self.c_fg,
                                 font=("Segoe UI", 11, "bold"))
         left_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
         
         self.activity_list = scrolledtext.ScrolledText(left_col, height=12,
-                                                       bg=self.colors["card_bg"],
-                                                       fg=self.colors["success"],
-                                                       font=("Consolas", 9))
+                                                       bg=self.c_card_bg,
+                                                       fg=self.c_success,
+                                                       font=("Consolas", 9),
+                                                       state=tk.DISABLED)
         self.activity_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.log_activity("Admin Panel started")
         
         # Right column - Quick actions
         right_col = tk.LabelFrame(columns_frame, text=" Quick Actions ",
-                                 bg=self.colors["bg"], fg=self.colors["fg"],
+                                 bg=self.c_bg, fg=self.c_fg,
                                  font=("Segoe UI", 11, "bold"))
         right_col.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
         
@@ -298,47 +501,48 @@ class AdminPanel:
             ("🧹 Clear All Sessions", self.clear_all_sessions),
             ("📊 Export Analytics", self.export_analytics),
             ("🔌 Test API Connection", self.test_connection),
-            ("📝 View Logs", lambda: self.notebook.select(8)),
-            ("⚙️ Server Settings", lambda: self.notebook.select(5)),
+            ("📝 View Logs", partial(self.select_tab, 8)),
+            ("⚙️ Server Settings", partial(self.select_tab, 5)),
             ("🚨 Emergency Stop", self.emergency_stop),
             ("💾 Backup Database", self.backup_database),
         ]
         
         for text, command in actions:
             btn = tk.Button(right_col, text=text, command=command,
-                           bg=self.colors["card_bg"], fg=self.colors["fg"],
+                           bg=self.c_card_bg, fg=self.c_fg,
                            font=("Segoe UI", 10), relief=tk.FLAT, 
                            cursor="hand2", anchor="w", padx=15, pady=8)
             btn.pack(fill=tk.X, padx=10, pady=3)
         
-    def create_sessions_tab(self):
+    def create_sessions_tab(self, tab):
         """Sessions management"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="💬 Sessions")
         
         # Toolbar
-        toolbar = tk.Frame(tab, bg=self.colors["bg"])
+        toolbar = tk.Frame(tab, bg=self.c_bg)
         toolbar.pack(fill=tk.X, padx=10, pady=10)
         
         tk.Button(toolbar, text="🔄 Refresh", command=self.load_sessions,
-                 bg=self.colors["card_bg"], fg=self.colors["fg"],
+                 bg=self.c_card_bg, fg=self.c_fg,
                  relief=tk.FLAT, cursor="hand2").pack(side=tk.LEFT, padx=5)
         tk.Button(toolbar, text="🧹 Clear All", command=self.clear_all_sessions,
-                 bg=self.colors["danger"], fg="white",
+                 bg=self.c_danger, fg="white",
                  relief=tk.FLAT, cursor="hand2").pack(side=tk.LEFT, padx=5)
         tk.Button(toolbar, text="📥 Export", command=self.export_sessions,
-                 bg=self.colors["card_bg"], fg=self.colors["fg"],
+                 bg=self.c_card_bg, fg=self.c_fg,
+                 relief=tk.FLAT, cursor="hand2").pack(side=tk.LEFT, padx=5)
+        tk.Button(toolbar, text="⬇️ Load More", command=self.load_more_sessions,
+                 bg=self.c_card_bg, fg=self.c_fg,
                  relief=tk.FLAT, cursor="hand2").pack(side=tk.LEFT, padx=5)
         
         # Search
-        tk.Label(toolbar, text="Search:", bg=self.colors["bg"], 
-                fg=self.colors["fg"]).pack(side=tk.LEFT, padx=(20, 5))
-        self.session_search = tk.Entry(toolbar, width=30, bg=self.colors["card_bg"],
-                                       fg=self.colors["fg"], insertbackground="white")
+        tk.Label(toolbar, text="Search:", bg=self.c_bg, 
+                fg=self.c_fg).pack(side=tk.LEFT, padx=(20, 5))
+        self.session_search = tk.Entry(toolbar, width=30, bg=self.c_card_bg,
+                                       fg=self.c_fg, insertbackground="white")
         self.session_search.pack(side=tk.LEFT, padx=5)
         self.session_search.bind('<KeyRelease>', self.filter_sessions)
         
-        # Sessions list
+        # Sessions list (virtualized - the scrollbar drives _repopulate_window)
         columns = ("ID", "Title", "Messages", "Created", "Last Active", "Status")
         self.sessions_tree = ttk.Treeview(tab, columns=columns, show="headings", height=20)
         
@@ -347,58 +551,56 @@ class AdminPanel:
             width = 150 if col in ["Title", "Created", "Last Active"] else 100
             self.sessions_tree.column(col, width=width)
         
-        scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=self.sessions_tree.yview)
-        self.sessions_tree.configure(yscrollcommand=scrollbar.set)
+        self.sessions_scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=self._yscroll)
         
         self.sessions_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=5)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=5, padx=(0, 10))
+        self.sessions_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=5, padx=(0, 10))
+        
+        self.sessions_tree.bind('<Configure>', self._update_window)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.sessions_tree.bind(sequence, self._on_sessions_wheel)
         
         # Context menu
         self.sessions_tree.bind('<Button-3>', self.show_session_menu)
         
-        # Load sessions
+        # Show anything fetched before the tab existed, then load fresh data
+        self._do_filter()
         self.load_sessions()
         
-    def create_users_tab(self):
+    def create_users_tab(self, tab):
         """User management (placeholder for future)"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="👥 Users")
         
         # Info
-        info_frame = tk.Frame(tab, bg=self.colors["card_bg"], padx=30, pady=30)
+        info_frame = tk.Frame(tab, bg=self.c_card_bg, padx=30, pady=30)
         info_frame.pack(expand=True)
         
         tk.Label(info_frame, text="👥", font=("Segoe UI", 48),
-                bg=self.colors["card_bg"], fg=self.colors["accent"]).pack()
+                bg=self.c_card_bg, fg=self.c_accent).pack()
         tk.Label(info_frame, text="User Management", font=("Segoe UI", 18, "bold"),
-                bg=self.colors["card_bg"], fg=self.colors["fg"]).pack(pady=10)
+                bg=self.c_card_bg, fg=self.c_fg).pack(pady=10)
         tk.Label(info_frame, text="Track and manage users\n(Coming in Pro version)",
-                font=("Segoe UI", 11), bg=self.colors["card_bg"], 
-                fg=self.colors["fg"]).pack()
+                font=("Segoe UI", 11), bg=self.c_card_bg, 
+                fg=self.c_fg).pack()
         
         # Stats preview
-        stats_preview = tk.Frame(tab, bg=self.colors["bg"])
+        stats_preview = tk.Frame(tab, bg=self.c_bg)
         stats_preview.pack(pady=20)
         
         for label, value in [("Total Users", "0"), ("Active Today", "0"), ("New This Week", "0")]:
-            card = tk.Frame(stats_preview, bg=self.colors["card_bg"], padx=30, pady=15)
+            card = ttk.Frame(stats_preview, style="Card.TFrame", padding=(30, 15))
             card.pack(side=tk.LEFT, padx=10)
-            tk.Label(card, text=value, font=("Segoe UI", 24, "bold"),
-                    bg=self.colors["card_bg"], fg=self.colors["accent"]).pack()
-            tk.Label(card, text=label, font=("Segoe UI", 10),
-                    bg=self.colors["card_bg"], fg=self.colors["fg"]).pack()
+            ttk.Label(card, text=value, style="Stat.TLabel").pack()
+            ttk.Label(card, text=label, style="Card.TLabel").pack()
         
-    def create_analytics_tab(self):
+    def create_analytics_tab(self, tab):
         """Analytics dashboard"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="📈 Analytics")
         
         # Date range selector
-        date_frame = tk.Frame(tab, bg=self.colors["bg"])
+        date_frame = tk.Frame(tab, bg=self.c_bg)
         date_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        tk.Label(date_frame, text="Date Range:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).pack(side=tk.LEFT, padx=5)
+        tk.Label(date_frame, text="Date Range:", bg=self.c_bg,
+                fg=self.c_fg).pack(side=tk.LEFT, padx=5)
         
         self.date_range = ttk.Combobox(date_frame, values=[
             "Today", "Last 7 Days", "Last 30 Days", "Last 90 Days", "All Time"
@@ -407,26 +609,26 @@ class AdminPanel:
         self.date_range.pack(side=tk.LEFT, padx=5)
         
         tk.Button(date_frame, text="📊 Generate Report", command=self.generate_report,
-                 bg=self.colors["accent"], fg="white",
+                 bg=self.c_accent, fg="white",
                  relief=tk.FLAT, cursor="hand2").pack(side=tk.LEFT, padx=20)
         
         # Charts frame
-        charts_frame = tk.Frame(tab, bg=self.colors["bg"])
+        charts_frame = tk.Frame(tab, bg=self.c_bg)
         charts_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Message chart (ASCII representation)
         chart1 = tk.LabelFrame(charts_frame, text=" Messages per Day ",
-                              bg=self.colors["bg"], fg=self.colors["fg"])
+                              bg=self.c_bg, fg=self.c_fg)
         chart1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
         
-        self.messages_chart = tk.Text(chart1, height=15, bg=self.colors["card_bg"],
-                                      fg=self.colors["accent"], font=("Consolas", 10))
+        self.messages_chart = tk.Text(chart1, height=15, bg=self.c_card_bg,
+                                      fg=self.c_accent, font=("Consolas", 10))
         self.messages_chart.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        self.draw_ascii_chart()
+        self.draw_ascii_chart(self._daily_messages)
         
         # Stats summary
         chart2 = tk.LabelFrame(charts_frame, text=" Summary Stats ",
-                              bg=self.colors["bg"], fg=self.colors["fg"])
+                              bg=self.c_bg, fg=self.c_fg)
         chart2.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5)
         
         summary_stats = [
@@ -439,21 +641,17 @@ class AdminPanel:
         ]
         
         for label, value in summary_stats:
-            row = tk.Frame(chart2, bg=self.colors["card_bg"])
+            row = ttk.Frame(chart2, style="Card.TFrame")
             row.pack(fill=tk.X, padx=10, pady=3)
-            tk.Label(row, text=label, bg=self.colors["card_bg"],
-                    fg=self.colors["fg"], anchor="w").pack(side=tk.LEFT)
-            tk.Label(row, text=value, bg=self.colors["card_bg"],
-                    fg=self.colors["accent"], font=("Segoe UI", 10, "bold")).pack(side=tk.RIGHT)
+            ttk.Label(row, text=label, style="Card.TLabel", anchor="w").pack(side=tk.LEFT)
+            ttk.Label(row, text=value, style="CardValue.TLabel").pack(side=tk.RIGHT)
         
-    def create_models_tab(self):
+    def create_models_tab(self, tab):
         """Model management"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="🤖 Models")
         
         # Available models
         models_frame = tk.LabelFrame(tab, text=" Available Models ",
-                                    bg=self.colors["bg"], fg=self.colors["fg"])
+                                    bg=self.c_bg, fg=self.c_fg)
         models_frame.pack(fill=tk.X, padx=10, pady=10)
         
         models = [
@@ -462,70 +660,65 @@ class AdminPanel:
         ]
         
         for model_id, name, desc in models:
-            row = tk.Frame(models_frame, bg=self.colors["card_bg"], pady=10, padx=15)
+            row = ttk.Frame(models_frame, style="Card.TFrame", padding=(15, 10))
             row.pack(fill=tk.X, padx=10, pady=5)
             
-            tk.Label(row, text="🤖", font=("Segoe UI", 16),
-                    bg=self.colors["card_bg"], fg=self.colors["accent"]).pack(side=tk.LEFT)
+            ttk.Label(row, text="🤖", style="CardIcon.TLabel").pack(side=tk.LEFT)
             
-            info_frame = tk.Frame(row, bg=self.colors["card_bg"])
+            info_frame = ttk.Frame(row, style="Card.TFrame")
             info_frame.pack(side=tk.LEFT, padx=15, fill=tk.X, expand=True)
-            tk.Label(info_frame, text=name, font=("Segoe UI", 11, "bold"),
-                    bg=self.colors["card_bg"], fg=self.colors["fg"]).pack(anchor="w")
-            tk.Label(info_frame, text=desc, font=("Segoe UI", 9),
-                    bg=self.colors["card_bg"], fg="#a0a0b0").pack(anchor="w")
+            ttk.Label(info_frame, text=name, style="CardTitle.TLabel").pack(anchor="w")
+            ttk.Label(info_frame, text=desc, style="CardMuted.TLabel").pack(anchor="w")
             
             if model_id == self.config["default_model"]:
-                tk.Label(row, text="✓ Default", bg=self.colors["success"],
+                tk.Label(row, text="✓ Default", bg=self.c_success,
                         fg="white", padx=10, pady=2).pack(side=tk.RIGHT)
             else:
                 tk.Button(row, text="Set Default", 
-                         command=lambda m=model_id: self.set_default_model(m),
-                         bg=self.colors["card_bg"], fg=self.colors["fg"],
+                         command=partial(self.set_default_model, model_id),
+                         bg=self.c_card_bg, fg=self.c_fg,
                          relief=tk.FLAT, cursor="hand2").pack(side=tk.RIGHT)
         
         # Model parameters
         params_frame = tk.LabelFrame(tab, text=" Model Parameters ",
-                                    bg=self.colors["bg"], fg=self.colors["fg"])
+                                    bg=self.c_bg, fg=self.c_fg)
         params_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        inner = tk.Frame(params_frame, bg=self.colors["bg"])
+        inner = tk.Frame(params_frame, bg=self.c_bg)
         inner.pack(pady=15, padx=15, fill=tk.X)
         
         # Temperature
-        tk.Label(inner, text="Temperature:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).grid(row=0, column=0, sticky="w", pady=5)
+        tk.Label(inner, text="Temperature:", bg=self.c_bg,
+                fg=self.c_fg).grid(row=0, column=0, sticky="w", pady=5)
         self.temp_scale = ttk.Scale(inner, from_=0, to=2, orient=tk.HORIZONTAL)
         self.temp_scale.set(self.config["temperature"])
         self.temp_scale.grid(row=0, column=1, sticky="ew", padx=10, pady=5)
-        self.temp_value = tk.Label(inner, text="0.7", bg=self.colors["bg"],
-                                  fg=self.colors["accent"])
+        self.temp_value = tk.Label(inner, text="0.7", bg=self.c_bg,
+                                  fg=self.c_accent)
         self.temp_value.grid(row=0, column=2, pady=5)
         self.temp_scale.configure(command=lambda v: self.temp_value.configure(text=f"{float(v):.1f}"))
         
         # Max tokens
-        tk.Label(inner, text="Max Tokens:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).grid(row=1, column=0, sticky="w", pady=5)
-        self.max_tokens_entry = tk.Entry(inner, bg=self.colors["card_bg"],
-                                        fg=self.colors["fg"], width=20)
+        tk.Label(inner, text="Max Tokens:", bg=self.c_bg,
+                fg=self.c_fg).grid(row=1, column=0, sticky="w", pady=5)
+        self.max_tokens_entry = tk.Entry(inner, bg=self.c_card_bg,
+                                        fg=self.c_fg, width=20)
         self.max_tokens_entry.insert(0, str(self.config["max_tokens"]))
         self.max_tokens_entry.grid(row=1, column=1, sticky="w", padx=10, pady=5)
         
         inner.columnconfigure(1, weight=1)
         
-    def create_settings_tab(self):
+    def create_settings_tab(self, tab):
         """Settings configuration"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="⚙️ Settings")
         
         # Create scrollable frame
-        canvas = tk.Canvas(tab, bg=self.colors["bg"], highlightthickness=0)
+        canvas = tk.Canvas(tab, bg=self.c_bg, highlightthickness=0)
         scrollbar = ttk.Scrollbar(tab, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors["bg"])
+        scrollable_frame = tk.Frame(canvas, bg=self.c_bg)
         
         scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            lambda e: self._queue_scrollregion_update(canvas)
         )
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
@@ -536,23 +729,23 @@ class AdminPanel:
         
         # Connection settings
         conn_frame = tk.LabelFrame(scrollable_frame, text=" Connection Settings ",
-                                   bg=self.colors["bg"], fg=self.colors["fg"])
+                                   bg=self.c_bg, fg=self.c_fg)
         conn_frame.pack(fill=tk.X, pady=10, padx=5)
         
-        inner = tk.Frame(conn_frame, bg=self.colors["bg"])
+        inner = tk.Frame(conn_frame, bg=self.c_bg)
         inner.pack(pady=15, padx=15, fill=tk.X)
         
-        tk.Label(inner, text="API URL:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).grid(row=0, column=0, sticky="w", pady=5)
-        self.api_url_entry = tk.Entry(inner, width=50, bg=self.colors["card_bg"],
-                                     fg=self.colors["fg"], insertbackground="white")
+        tk.Label(inner, text="API URL:", bg=self.c_bg,
+                fg=self.c_fg).grid(row=0, column=0, sticky="w", pady=5)
+        self.api_url_entry = tk.Entry(inner, width=50, bg=self.c_card_bg,
+                                     fg=self.c_fg, insertbackground="white")
         self.api_url_entry.insert(0, self.config["api_url"])
         self.api_url_entry.grid(row=0, column=1, padx=10, pady=5, sticky="ew")
         
-        tk.Label(inner, text="Admin PIN:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).grid(row=1, column=0, sticky="w", pady=5)
+        tk.Label(inner, text="Admin PIN:", bg=self.c_bg,
+                fg=self.c_fg).grid(row=1, column=0, sticky="w", pady=5)
         self.admin_pin_entry = tk.Entry(inner, width=50, show="*",
-                                       bg=self.colors["card_bg"], fg=self.colors["fg"])
+                                       bg=self.c_card_bg, fg=self.c_fg)
         self.admin_pin_entry.insert(0, self.config["admin_pin"])
         self.admin_pin_entry.grid(row=1, column=1, padx=10, pady=5, sticky="ew")
         
@@ -560,187 +753,181 @@ class AdminPanel:
         
         # Auto-refresh settings
         refresh_frame = tk.LabelFrame(scrollable_frame, text=" Auto-Refresh ",
-                                      bg=self.colors["bg"], fg=self.colors["fg"])
+                                      bg=self.c_bg, fg=self.c_fg)
         refresh_frame.pack(fill=tk.X, pady=10, padx=5)
         
-        refresh_inner = tk.Frame(refresh_frame, bg=self.colors["bg"])
+        refresh_inner = tk.Frame(refresh_frame, bg=self.c_bg)
         refresh_inner.pack(pady=15, padx=15, fill=tk.X)
         
         self.auto_refresh_var = tk.BooleanVar(value=self.config["auto_refresh"])
         tk.Checkbutton(refresh_inner, text="Enable Auto-Refresh",
-                      variable=self.auto_refresh_var, bg=self.colors["bg"],
-                      fg=self.colors["fg"], selectcolor=self.colors["card_bg"]).pack(anchor="w")
+                      variable=self.auto_refresh_var, bg=self.c_bg,
+                      fg=self.c_fg, selectcolor=self.c_card_bg).pack(anchor="w")
         
-        tk.Label(refresh_inner, text="Refresh Interval (ms):", bg=self.colors["bg"],
-                fg=self.colors["fg"]).pack(anchor="w", pady=(10, 0))
+        tk.Label(refresh_inner, text="Refresh Interval (ms):", bg=self.c_bg,
+                fg=self.c_fg).pack(anchor="w", pady=(10, 0))
         self.refresh_interval_entry = tk.Entry(refresh_inner, width=20,
-                                              bg=self.colors["card_bg"], fg=self.colors["fg"])
+                                              bg=self.c_card_bg, fg=self.c_fg)
         self.refresh_interval_entry.insert(0, str(self.config["refresh_interval"]))
         self.refresh_interval_entry.pack(anchor="w", pady=5)
         
         # Save button
         tk.Button(scrollable_frame, text="💾 Save All Settings", command=self.save_settings,
-                 bg=self.colors["accent"], fg="white", font=("Segoe UI", 12, "bold"),
+                 bg=self.c_accent, fg="white", font=("Segoe UI", 12, "bold"),
                  padx=30, pady=10, relief=tk.FLAT, cursor="hand2").pack(pady=20)
         
-    def create_api_tab(self):
+    def create_api_tab(self, tab):
         """API testing"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="🔌 API")
         
         # Endpoint testing
         test_frame = tk.LabelFrame(tab, text=" Test API Endpoints ",
-                                   bg=self.colors["bg"], fg=self.colors["fg"])
+                                   bg=self.c_bg, fg=self.c_fg)
         test_frame.pack(fill=tk.X, pady=10, padx=10)
         
-        inner = tk.Frame(test_frame, bg=self.colors["bg"])
+        inner = tk.Frame(test_frame, bg=self.c_bg)
         inner.pack(pady=15, padx=15, fill=tk.X)
         
-        tk.Label(inner, text="Method:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).grid(row=0, column=0, pady=5)
+        tk.Label(inner, text="Method:", bg=self.c_bg,
+                fg=self.c_fg).grid(row=0, column=0, pady=5)
         self.method_combo = ttk.Combobox(inner, values=["GET", "POST", "DELETE"], width=10)
         self.method_combo.set("GET")
         self.method_combo.grid(row=0, column=1, padx=5, pady=5)
         
-        tk.Label(inner, text="Endpoint:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).grid(row=0, column=2, padx=(20, 5), pady=5)
-        self.endpoint_entry = tk.Entry(inner, width=40, bg=self.colors["card_bg"],
-                                      fg=self.colors["fg"], insertbackground="white")
+        tk.Label(inner, text="Endpoint:", bg=self.c_bg,
+                fg=self.c_fg).grid(row=0, column=2, padx=(20, 5), pady=5)
+        self.endpoint_entry = tk.Entry(inner, width=40, bg=self.c_card_bg,
+                                      fg=self.c_fg, insertbackground="white")
         self.endpoint_entry.insert(0, "/")
         self.endpoint_entry.grid(row=0, column=3, padx=5, pady=5)
         
         tk.Button(inner, text="🚀 Send", command=self.test_endpoint,
-                 bg=self.colors["accent"], fg="white",
+                 bg=self.c_accent, fg="white",
                  relief=tk.FLAT, cursor="hand2").grid(row=0, column=4, padx=10, pady=5)
         
         # Quick endpoints
-        quick_frame = tk.Frame(test_frame, bg=self.colors["bg"])
+        quick_frame = tk.Frame(test_frame, bg=self.c_bg)
         quick_frame.pack(fill=tk.X, padx=15, pady=(0, 15))
         
         for endpoint in ["/", "/sessions", "/db/stats", "/settings"]:
             tk.Button(quick_frame, text=endpoint,
-                     command=lambda e=endpoint: self.quick_test(e),
-                     bg=self.colors["card_bg"], fg=self.colors["fg"],
+                     command=partial(self.quick_test, endpoint),
+                     bg=self.c_card_bg, fg=self.c_fg,
                      relief=tk.FLAT, cursor="hand2").pack(side=tk.LEFT, padx=5)
         
         # Response area
         resp_frame = tk.LabelFrame(tab, text=" Response ",
-                                   bg=self.colors["bg"], fg=self.colors["fg"])
+                                   bg=self.c_bg, fg=self.c_fg)
         resp_frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=10)
         
         self.response_text = scrolledtext.ScrolledText(resp_frame, 
-                                                       bg=self.colors["card_bg"],
-                                                       fg=self.colors["success"],
+                                                       bg=self.c_card_bg,
+                                                       fg=self.c_success,
                                                        font=("Consolas", 10))
         self.response_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-    def create_security_tab(self):
+    def create_security_tab(self, tab):
         """Security settings"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="🔐 Security")
         
         # PIN management
         pin_frame = tk.LabelFrame(tab, text=" Admin PIN Management ",
-                                 bg=self.colors["bg"], fg=self.colors["fg"])
+                                 bg=self.c_bg, fg=self.c_fg)
         pin_frame.pack(fill=tk.X, pady=10, padx=10)
         
-        inner = tk.Frame(pin_frame, bg=self.colors["bg"])
+        inner = tk.Frame(pin_frame, bg=self.c_bg)
         inner.pack(pady=15, padx=15, fill=tk.X)
         
-        tk.Label(inner, text="Current PIN:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).grid(row=0, column=0, sticky="w", pady=5)
+        tk.Label(inner, text="Current PIN:", bg=self.c_bg,
+                fg=self.c_fg).grid(row=0, column=0, sticky="w", pady=5)
         self.current_pin = tk.Entry(inner, width=20, show="*",
-                                   bg=self.colors["card_bg"], fg=self.colors["fg"])
+                                   bg=self.c_card_bg, fg=self.c_fg)
         self.current_pin.grid(row=0, column=1, padx=10, pady=5)
         
-        tk.Label(inner, text="New PIN:", bg=self.colors["bg"],
-                fg=self.colors["fg"]).grid(row=1, column=0, sticky="w", pady=5)
+        tk.Label(inner, text="New PIN:", bg=self.c_bg,
+                fg=self.c_fg).grid(row=1, column=0, sticky="w", pady=5)
         self.new_pin = tk.Entry(inner, width=20, show="*",
-                               bg=self.colors["card_bg"], fg=self.colors["fg"])
+                               bg=self.c_card_bg, fg=self.c_fg)
         self.new_pin.grid(row=1, column=1, padx=10, pady=5)
         
         tk.Button(inner, text="Change PIN", command=self.change_pin,
-                 bg=self.colors["accent"], fg="white",
+                 bg=self.c_accent, fg="white",
                  relief=tk.FLAT, cursor="hand2").grid(row=1, column=2, padx=10, pady=5)
         
         # Access log
         log_frame = tk.LabelFrame(tab, text=" Security Log ",
-                                 bg=self.colors["bg"], fg=self.colors["fg"])
+                                 bg=self.c_bg, fg=self.c_fg)
         log_frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=10)
         
         self.security_log = scrolledtext.ScrolledText(log_frame, height=15,
-                                                      bg=self.colors["card_bg"],
-                                                      fg=self.colors["warning"],
+                                                      bg=self.c_card_bg,
+                                                      fg=self.c_warning,
                                                       font=("Consolas", 9))
         self.security_log.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.security_log.insert(tk.END, f"[{self.get_timestamp()}] Admin Panel accessed\n")
-        self.security_log.insert(tk.END, f"[{self.get_timestamp()}] IP: {self.get_local_ip()}\n")
+        self._buffered_log("security_log", f"[{self._accessed_at}] Admin Panel accessed\n")
+        self._buffered_log("security_log", f"[{self.get_timestamp()}] IP: {self.get_local_ip()}\n")
         
-    def create_tools_tab(self):
+    def create_tools_tab(self, tab):
         """Tools and utilities"""
-        tab = tk.Frame(self.notebook, bg=self.colors["bg"])
-        self.notebook.add(tab, text="🛠️ Tools")
         
         # Tools grid
-        tools_frame = tk.Frame(tab, bg=self.colors["bg"])
+        tools_frame = tk.Frame(tab, bg=self.c_bg)
         tools_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        tools = [
-            ("💾 Backup Database", "Create full backup", self.backup_database),
-            ("📥 Restore Backup", "Restore from file", self.restore_backup),
-            ("🧹 Clear Sessions", "Delete all sessions", self.clear_all_sessions),
-            ("📊 Export Analytics", "Download report", self.export_analytics),
-            ("🔄 Restart Server", "Restart backend", self.restart_server),
-            ("📝 View Server Logs", "Check logs", self.view_server_logs),
-            ("🔌 Check Ports", "Port scanner", self.check_ports),
-            ("🌐 Network Info", "Connection details", self.show_network_info),
-        ]
-        
-        for i, (title, desc, command) in enumerate(tools):
+        for i, (glyph, title, desc, method) in enumerate(TOOLS):
             row, col = divmod(i, 4)
-            card = tk.Frame(tools_frame, bg=self.colors["card_bg"], padx=15, pady=15)
+            card = ttk.Frame(tools_frame, style="Card.TFrame", padding=15)
             card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
             tools_frame.columnconfigure(col, weight=1)
             
-            tk.Label(card, text=title.split()[0], font=("Segoe UI", 24),
-                    bg=self.colors["card_bg"], fg=self.colors["accent"]).pack()
-            tk.Label(card, text=title.split(None, 1)[1], font=("Segoe UI", 11, "bold"),
-                    bg=self.colors["card_bg"], fg=self.colors["fg"]).pack()
-            tk.Label(card, text=desc, font=("Segoe UI", 9),
-                    bg=self.colors["card_bg"], fg="#a0a0b0").pack()
-            tk.Button(card, text="Run", command=command,
-                     bg=self.colors["accent"], fg="white",
+            ttk.Label(card, text=glyph, style="CardGlyph.TLabel").pack()
+            ttk.Label(card, text=title, style="CardTitle.TLabel").pack()
+            ttk.Label(card, text=desc, style="CardMuted.TLabel").pack()
+            tk.Button(card, text="Run", command=getattr(self, method),
+                     bg=self.c_accent, fg="white",
                      relief=tk.FLAT, cursor="hand2", padx=20).pack(pady=10)
         
         # Logs area
         logs_frame = tk.LabelFrame(tab, text=" System Logs ",
-                                  bg=self.colors["bg"], fg=self.colors["fg"])
+                                  bg=self.c_bg, fg=self.c_fg)
         logs_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         self.tools_log = scrolledtext.ScrolledText(logs_frame, height=10,
-                                                   bg=self.colors["card_bg"],
-                                                   fg=self.colors["success"],
+                                                   bg=self.c_card_bg,
+                                                   fg=self.c_success,
                                                    font=("Consolas", 9))
         self.tools_log.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.tools_log.insert(tk.END, f"[{self.get_timestamp()}] Tools initialized\n")
+        self._buffered_log("tools_log", f"[{self.get_timestamp()}] Tools initialized\n")
         
     # ==================== Helper Functions ====================
     
     def create_stat_card(self, parent, label, value, color):
-        """Create a stat card widget"""
-        card = tk.Frame(parent, bg=self.colors["card_bg"], padx=20, pady=15)
+        """Create a stat card widget (color is a COLORS key)"""
+        card = ttk.Frame(parent, style="Card.TFrame", padding=(20, 15))
         
-        val_label = tk.Label(card, text=value, font=("Segoe UI", 22, "bold"),
-                            fg=color, bg=self.colors["card_bg"])
+        val_label = ttk.Label(card, text=value, style=f"{color.title()}.Metric.TLabel")
         val_label.pack()
         
-        name_label = tk.Label(card, text=label, font=("Segoe UI", 9),
-                             fg="#a0a0b0", bg=self.colors["card_bg"])
+        name_label = ttk.Label(card, text=label, style="CardMuted.TLabel")
         name_label.pack()
         
         self.stat_labels[label.lower().replace(" ", "_")] = val_label
         return card
     
+    def _queue_scrollregion_update(self, canvas):
+        """Coalesce <Configure> storms into one scrollregion update per idle pass"""
+        canvas_id = id(canvas)
+        if canvas_id in self._sr_pending:
+            return
+        self._sr_pending.add(canvas_id)
+        self.root.after_idle(self._apply_sr, canvas, canvas_id)
+    
+    def _apply_sr(self, canvas, canvas_id):
+        """Update a canvas scrollregion if its contents' bbox changed"""
+        self._sr_pending.discard(canvas_id)
+        bbox = canvas.bbox("all")
+        if bbox != self._sr_last.get(canvas_id):
+            canvas.configure(scrollregion=bbox)
+            self._sr_last[canvas_id] = bbox
+    
     def create_tooltip(self, widget, text):
         """Create tooltip for widget"""
         def show_tooltip(event):
@@ -760,27 +947,79 @@ class AdminPanel:
         widget.bind('<Leave>', hide_tooltip)
     
     def get_timestamp(self):
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Log bursts land within the same second - format once per second
+        now = int(time.time())
+        second, text = self._ts_cache
+        if second != now:
+            text = time.strftime(self._ts_fmt, time.localtime(now))
+            self._ts_cache = (now, text)
+        return text
     
     def get_local_ip(self):
+        """Cached local IP; 127.0.0.1 until the first lookup finishes"""
+        with self._local_ip_lock:
+            return self._local_ip or "127.0.0.1"
+    
+    def refresh_local_ip(self):
+        """Re-resolve the local IP on the worker pool every LOCAL_IP_REFRESH_MS"""
+        self.executor.submit(self._resolve_local_ip)
+        self.root.after(LOCAL_IP_REFRESH_MS, self.refresh_local_ip)
+    
+    def _resolve_local_ip(self):
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             s.connect(("8.8.8.8", 80))
             ip = s.getsockname()[0]
             s.close()
-            return ip
         except:
-            return "127.0.0.1"
+            ip = "127.0.0.1"
+        with self._local_ip_lock:
+            self._local_ip = ip
     
     def log_activity(self, message):
         timestamp = self.get_timestamp()
-        self.activity_list.insert(tk.END, f"[{timestamp}] {message}\n")
+        self._log_queue.append(f"[{timestamp}] {message}\n")
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after_idle(self._flush_log)
+    
+    def _flush_log(self):
+        """Append the queued lines to the activity log, dropping the oldest past ACTIVITY_LOG_LINES"""
+        self._log_flush_scheduled = False
+        self.activity_list.configure(state=tk.NORMAL)
+        self.activity_list.insert(tk.END, ''.join(self._log_queue))
+        self._log_queue.clear()
+        self._trim_log(self.activity_list, ACTIVITY_LOG_LINES, 0)
         self.activity_list.see(tk.END)
+        self.activity_list.configure(state=tk.DISABLED)
+    
+    def _buffered_log(self, name, text):
+        """Queue text for a log widget; pending text is written on the next flush"""
+        self._log_buffers[name].append(text)
+        if not self._log_pending:
+            self._log_pending = True
+            self.root.after(100, self._flush_logs)
+    
+    def _flush_logs(self):
+        """Write each log widget's pending text with a single insert"""
+        self._log_pending = False
+        for name, buf in self._log_buffers.items():
+            widget = getattr(self, name, None)
+            if not buf or widget is None:
+                continue
+            widget.insert(tk.END, "".join(buf))
+            self._trim_log(widget)
+            widget.see(tk.END)
+            buf.clear()
+    
+    def _trim_log(self, widget, max_lines=MAX_LOG_LINES, slack=LOG_TRIM_SLACK):
+        """Drop the oldest lines once a log widget grows past max_lines (plus slack)"""
+        end_line = int(widget.index('end-1c').split('.')[0])
+        if end_line > max_lines + slack:
+            widget.delete('1.0', f'{end_line - max_lines}.0')
     
     def draw_ascii_chart(self, data=None):
         """Draw ASCII bar chart from dynamic data"""
-        self.messages_chart.delete('1.0', tk.END)
-        
         # Default empty data
         days = []
         values = []
@@ -796,76 +1035,179 @@ class AdminPanel:
             
             days.append(display_day)
             values.append(date_map.get(day_str, 0))
+        
+        # Nothing to redraw if the bars and labels are unchanged
+        sig = (tuple(values), tuple(days))
+        if sig == self._chart_sig:
+            return
+        self._chart_sig = sig
             
         # Draw chart
         max_val = max(values) if values and max(values) > 0 else 10
         
-        chart = ""
-        rows = 10
-        for i in range(rows, 0, -1):
-            threshold = (max_val / rows) * i
-            label = int(threshold)
-            line = f"{label:3d} |"
-            for v in values:
-                bar_height = (v / max_val) * rows
-                if bar_height >= i:
-                    line += " █ "
-                elif bar_height >= i - 0.5:
-                    line += " ▄ "
-                else:
-                    line += "   "
-            chart += line + "\n"
+        lines = []
+        # Bar heights in whole half-rows and the axis step, computed once per redraw
+        halves = [v * CHART_ROWS * 2 // max_val for v in values]
+        step = max_val / CHART_ROWS
+        for i in range(CHART_ROWS, 0, -1):
+            base = 2 * i - 2
+            cells = "".join([BAR_GLYPHS[min(max(h - base, 0), 2)] for h in halves])
+            lines.append(f"{int(step * i):3d} |{cells}")
         
-        chart += "    +" + "---" * 7 + "\n"
-        chart += "     " + " ".join([f"{d:3}" for d in days])
+        lines.append(CHART_AXIS)
+        lines.append("     " + " ".join([f"{d:3}" for d in days]))
         
-        self.messages_chart.insert(tk.END, chart)
+        self.messages_chart.delete('1.0', tk.END)
+        self.messages_chart.insert(tk.END, "\n".join(lines))
     
     # ==================== API Functions ====================
     
-    def api_request(self, endpoint, method="GET", data=None):
-        """Make API request"""
+    def post_to_ui(self, callback, *args):
+        """Schedule callback on the Tk thread (safe to call from workers)"""
+        try:
+            self.root.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Window already closed
+    
+    def run_async(self, func, callback, *args, on_error=None):
+        """Run func(*args) on the worker pool and pass its result to callback on the Tk thread.
+        If func fails, on_error(message) runs instead, or callback({"error": message}) without one."""
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(partial(self._deliver_result, callback, on_error))
+    
+    def _deliver_result(self, callback, on_error, future):
+        """Done-callback for run_async - a raise here would be swallowed by the executor"""
+        error = self._future_error(future)
+        if error is None:
+            self.post_to_ui(callback, future.result())
+        elif on_error is not None:
+            self.post_to_ui(on_error, error)
+        else:
+            self.post_to_ui(callback, {"error": error})
+    
+    @staticmethod
+    def _future_error(future):
+        """Error message of a failed or cancelled future, None if it succeeded"""
+        if future.cancelled():
+            return "Cancelled"
+        error = future.exception()
+        if error is None:
+            return None
+        return str(error) or type(error).__name__
+    
+    def fetch_many(self, endpoints, callback):
+        """GET several endpoints concurrently, then call callback({endpoint: result}) on the Tk thread"""
+        results = {}
+        lock = threading.Lock()
+        
+        def on_done(endpoint, future):
+            # A failed fetch gets an error result like api_request's, so callback still runs
+            error = self._future_error(future)
+            with lock:
+                results[endpoint] = future.result() if error is None else {"error": error}
+                finished = len(results) == len(endpoints)
+            if finished:
+                self.post_to_ui(callback, results)
+        
+        for endpoint in endpoints:
+            future = self.executor.submit(self.api_request, endpoint)
+            future.add_done_callback(partial(on_done, endpoint))
+    
+    def _http(self):
+        """Get the shared HTTP client (requests session or cached urllib opener)"""
+        if HAS_REQUESTS:
+            return self.session
+        if self._opener is None:
+            self._opener = urllib.request.build_opener(urllib.request.HTTPHandler())
+        return self._opener
+    
+    def api_request(self, endpoint, method="GET", data=None, params=None):
+        """Make API request (params are URL-encoded into the query string)"""
+        cacheable = method == "GET" and not params
+        now = time.monotonic()
+        with self._get_cache_lock:
+            if cacheable:
+                hit = self._get_cache.get(endpoint)
+                if hit and hit[0] > now:
+                    return hit[1]
+            else:
+                # Anything else may change what the GETs return
+                self._get_cache.clear()
+        
+        result = self._api_request(endpoint, method, data, params)
+        
+        if cacheable and "error" not in result:
+            with self._get_cache_lock:
+                if len(self._get_cache) >= GET_CACHE_SIZE:
+                    self._get_cache = {k: v for k, v in self._get_cache.items() if v[0] > now}
+                    if len(self._get_cache) >= GET_CACHE_SIZE:
+                        self._get_cache.pop(next(iter(self._get_cache)))
+                self._get_cache[endpoint] = (now + GET_CACHE_TTL, result)
+        return result
+    
+    def _api_request(self, endpoint, method, data, params):
         url = f"{self.config['api_url']}{endpoint}"
         
         if HAS_REQUESTS:
             try:
-                if method == "GET":
-                    response = requests.get(url, timeout=10)
-                elif method == "POST":
-                    response = requests.post(url, json=data, timeout=10)
-                elif method == "DELETE":
-                    response = requests.delete(url, timeout=10)
+                response = self._http().request(method, url, params=params, json=data, timeout=5)
                 return response.json()
             except Exception as e:
                 return {"error": str(e)}
         else:
             try:
+                if params:
+                    url += "?" + urllib.parse.urlencode(params)
                 req = urllib.request.Request(url, method=method)
+                if self.config["api_key"]:
+                    req.add_header('X-Admin-Key', self.config["api_key"])
                 if data:
                     req.add_header('Content-Type', 'application/json')
                     data = json.dumps(data).encode('utf-8')
-                    response = urllib.request.urlopen(req, data, timeout=10)
+                    response = self._http().open(req, data, timeout=5)
                 else:
-                    response = urllib.request.urlopen(req, timeout=10)
+                    response = self._http().open(req, timeout=5)
                 return json.loads(response.read().decode('utf-8'))
             except Exception as e:
                 return {"error": str(e)}
     
+    def api_stream(self, endpoint, out_path):
+        """Copy a response body straight to out_path; returns an error message or None"""
+        url = f"{self.config['api_url']}{endpoint}"
+        try:
+            if HAS_REQUESTS:
+                with self.session.get(url, stream=True, timeout=60) as response:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    with open(out_path, "wb") as f:
+                        shutil.copyfileobj(response.raw, f, 1 << 16)
+            else:
+                req = urllib.request.Request(url)
+                if self.config["api_key"]:
+                    req.add_header('X-Admin-Key', self.config["api_key"])
+                with self._http().open(req, timeout=60) as response, open(out_path, "wb") as f:
+                    shutil.copyfileobj(response, f, 1 << 16)
+        except Exception as e:
+            return str(e)
+        return None
+    
     def refresh_all(self):
         """Refresh all data"""
         self.log_activity("Refreshing all data...")
-        self.refresh_stats()
-        self.load_sessions()
+        
+        sessions = self.sessions_endpoint()
+        gen = self._begin_sessions_load()
+        
+        def apply(results):
+            self.update_stats(results["/"], results["/db/stats"])
+            self._apply_sessions(gen, self.populate_sessions, results[sessions])
+        
+        self.fetch_many(["/", "/db/stats", sessions], apply)
     
     def refresh_stats(self):
         """Refresh dashboard stats"""
-        def fetch():
-            result = self.api_request("/")
-            db_stats = self.api_request("/db/stats")
-            
-            self.root.after(0, lambda: self.update_stats(result, db_stats))
-        
-        threading.Thread(target=fetch, daemon=True).start()
+        self.fetch_many(["/", "/db/stats"],
+                        lambda results: self.update_stats(results["/"], results["/db/stats"]))
     
     def update_stats(self, result, db_stats):
         """Update dashboard with stats"""
@@ -879,48 +1221,194 @@ class AdminPanel:
             if "total_messages" in db_stats:
                 if "total_messages" in self.stat_labels:
                     self.stat_labels["total_messages"].config(text=str(db_stats["total_messages"]))
-            if "daily_messages" in db_stats and hasattr(self, 'messages_chart'):
-                self.draw_ascii_chart(db_stats["daily_messages"])
+            if "daily_messages" in db_stats:
+                self._daily_messages = db_stats["daily_messages"]
+                if hasattr(self, 'messages_chart'):
+                    self.draw_ascii_chart(self._daily_messages)
         else:
             self.update_status("Disconnected", False)
             self.log_activity(f"Connection error: {result.get('error', 'Unknown')}")
     
     def update_status(self, text, connected):
         """Update connection status"""
-        color = self.colors["success"] if connected else self.colors["danger"]
+        color = self.c_success if connected else self.c_danger
         self.status_label.config(text=f"● {text}", fg=color)
         self.sidebar_status.config(fg=color)
     
+    def sessions_endpoint(self):
+        """/sessions URL for the pages loaded so far"""
+        return f"/sessions?limit={self._sessions_limit}"
+    
+    def _begin_sessions_load(self):
+        """Start a sessions load (Tk thread), superseding any load still in flight"""
+        self._sessions_gen += 1
+        return self._sessions_gen
+    
+    def _apply_sessions(self, gen, callback, *args):
+        """Run a sessions update on the Tk thread unless a newer load has started"""
+        if gen == self._sessions_gen:
+            callback(*args)
+    
     def load_sessions(self):
         """Load sessions from API"""
-        def fetch():
-            result = self.api_request("/sessions")
-            self.root.after(0, lambda: self.populate_sessions(result))
-        
-        threading.Thread(target=fetch, daemon=True).start()
+        gen = self._begin_sessions_load()
+        if HAS_REQUESTS and HAS_IJSON:
+            self.executor.submit(self._stream_sessions, gen)
+        else:
+            self.run_async(self.api_request, partial(self._apply_sessions, gen, self.populate_sessions),
+                           self.sessions_endpoint())
+    
+    def load_more_sessions(self):
+        """Fetch one more page of sessions"""
+        self._sessions_limit += SESSIONS_PAGE
+        self.load_sessions()
+    
+    def _stream_sessions(self, gen):
+        """Parse /sessions incrementally, handing rows to the UI in batches as they arrive"""
+        url = f"{self.config['api_url']}{self.sessions_endpoint()}"
+        try:
+            with self.session.get(url, stream=True, timeout=5) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                self.post_to_ui(self._apply_sessions, gen, self._reset_sessions)
+                count = 0
+                batch = []
+                for session in ijson.items(response.raw, "sessions.item"):
+                    batch.append(session)
+                    if len(batch) == 100:
+                        if gen != self._sessions_gen:
+                            return  # superseded by a newer load - stop reading
+                        self.post_to_ui(self._apply_sessions, gen, self._append_session_rows, batch)
+                        count += len(batch)
+                        batch = []
+                self.post_to_ui(self._apply_sessions, gen, self._append_session_rows, batch)
+                self.post_to_ui(self._apply_sessions, gen, self.log_activity,
+                                f"Loaded {count + len(batch)} sessions")
+        except Exception as e:
+            self.post_to_ui(self._apply_sessions, gen, self.populate_sessions, {"error": str(e)})
     
     def populate_sessions(self, result):
         """Populate sessions tree"""
-        self.sessions_tree.delete(*self.sessions_tree.get_children())
+        self._reset_sessions()
         
         if "sessions" in result:
-            for session in result["sessions"]:
-                self.sessions_tree.insert("", tk.END, values=(
-                    session.get("id", "")[:12] + "...",
-                    session.get("title", "New Chat")[:30],
-                    session.get("message_count", 0),
-                    session.get("created_at", "")[:10],
-                    session.get("updated_at", "")[:16],
-                    "Active" if session.get("is_active") else "Inactive"
-                ))
+            self._append_session_rows(result["sessions"])
             self.log_activity(f"Loaded {len(result['sessions'])} sessions")
     
-    def filter_sessions(self, event):
-        """Filter sessions by search"""
-        search_term = self.session_search.get().lower()
-        # Reload and filter
+    def _reset_sessions(self):
+        """Drop the cached sessions and their rows"""
+        self._all_sessions = []
+        if hasattr(self, 'sessions_tree'):
+            # Row iids are indexes into _all_sessions, so old rows must go before reloading
+            self.sessions_tree.delete(*self.sessions_tree.get_children())
+            self._do_filter()
+    
+    def _append_session_rows(self, sessions):
+        """Add sessions to the cache and refresh the visible window"""
+        for session in sessions:
+            values = (
+                session.get("id", "")[:12] + "...",
+                session.get("title", "New Chat")[:30],
+                session.get("message_count", 0),
+                session.get("created_at", "")[:10],
+                session.get("updated_at", "")[:16],
+                "Active" if session.get("is_active") else "Inactive"
+            )
+            key = f"{session.get('id', '')} {session.get('title', '')}"
+            self._all_sessions.append((values, key))
+        
+        if not hasattr(self, 'sessions_tree'):
+            return  # Sessions tab not built yet - it renders the cache when opened
+        
+        self._do_filter()
+        # Row height can only be measured once rows are laid out
+        self.root.after_idle(self._update_window)
+    
+    def filter_sessions(self, event=None):
+        """Filter sessions by search (debounced while typing)"""
+        if self._filter_after_id:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(150, self._do_filter)
+        
+        # Searching filters the cached list; only go back to the server when
+        # there is nothing cached yet, and only once typing pauses
+        if self._reload_after_id:
+            self.root.after_cancel(self._reload_after_id)
+            self._reload_after_id = None
+        if not self._all_sessions:
+            self._reload_after_id = self.root.after(300, self._reload_sessions)
+    
+    def _reload_sessions(self):
+        self._reload_after_id = None
         self.load_sessions()
     
+    def _do_filter(self):
+        """Apply the search box to the cached sessions"""
+        self._filter_after_id = None
+        search_term = self.session_search.get()
+        if search_term:
+            if search_term != self._filter_text:
+                self._filter_text = search_term
+                self._filter_re = re.compile(re.escape(search_term), re.IGNORECASE)
+            search = self._filter_re.search
+            self._filtered_sessions = [i for i, (_, key) in enumerate(self._all_sessions)
+                                       if search(key)]
+        else:
+            self._filtered_sessions = list(range(len(self._all_sessions)))
+        self._repopulate_window(0)
+    
+    def _repopulate_window(self, first):
+        """Materialize only the filtered rows from first to first + window size"""
+        total = len(self._filtered_sessions)
+        first = max(0, min(first, total - self._window_size))
+        last = min(total, first + self._window_size)
+        self._window_first = first
+        
+        wanted = [str(i) for i in self._filtered_sessions[first:last]]
+        keep = set(wanted)
+        stale = [iid for iid in self.sessions_tree.get_children() if iid not in keep]
+        if stale:
+            self.sessions_tree.delete(*stale)
+        for position, iid in enumerate(wanted):
+            if self.sessions_tree.exists(iid):
+                self.sessions_tree.move(iid, "", position)
+            else:
+                self.sessions_tree.insert("", position, iid=iid,
+                                          values=self._all_sessions[int(iid)][0])
+        
+        if total:
+            self.sessions_scrollbar.set(first / total, last / total)
+        else:
+            self.sessions_scrollbar.set(0, 1)
+    
+    def _update_window(self, event=None):
+        """Fit the window size to the rows visible in the sessions tree"""
+        children = self.sessions_tree.get_children()
+        bbox = self.sessions_tree.bbox(children[0]) if children else ""
+        if bbox:
+            top, row_height = bbox[1], bbox[3]
+        else:
+            top = row_height = SESSION_ROW_HEIGHT
+        self._window_size = max(1, (self.sessions_tree.winfo_height() - top) // row_height)
+        self._repopulate_window(self._window_first)
+    
+    def _yscroll(self, *args):
+        """Scrollbar command - moves the window over the filtered sessions"""
+        if args[0] == "moveto":
+            first = int(float(args[1]) * len(self._filtered_sessions))
+        else:
+            step = self._window_size if args[2] == "pages" else 1
+            first = self._window_first + int(args[1]) * step
+        self._repopulate_window(first)
+    
+    def _on_sessions_wheel(self, event):
+        """Scroll the sessions window with the mouse wheel"""
+        if event.num == 4 or event.delta > 0:
+            self._repopulate_window(self._window_first - 3)
+        else:
+            self._repopulate_window(self._window_first + 3)
+        return "break"
+    
     def show_session_menu(self, event):
         """Show context menu for session"""
         menu = tk.Menu(self.root, tearoff=0)
@@ -956,8 +1444,10 @@ class AdminPanel:
     def test_connection(self):
         """Test API connection"""
         self.log_activity("Testing connection...")
-        result = self.api_request("/")
-        
+        self.run_async(self.api_request, self.show_connection_result, "/")
+    
+    def show_connection_result(self, result):
+        """Report the outcome of test_connection"""
         if "error" not in result:
             messagebox.showinfo("Connection", f"✅ Connected!\n\nStatus: {result.get('status', 'OK')}")
             self.update_status("Connected", True)
@@ -971,8 +1461,32 @@ class AdminPanel:
         method = self.method_combo.get()
         
         self.log_activity(f"Testing {method} {endpoint}")
-        result = self.api_request(endpoint, method)
-        
+        if HAS_REQUESTS:
+            self.executor.submit(self._stream_response, endpoint, method)
+        else:
+            self.run_async(self.api_request, self.show_response, endpoint, method)
+    
+    def _stream_response(self, endpoint, method):
+        """Send a test request; large bodies are streamed into the response box in chunks"""
+        url = f"{self.config['api_url']}{endpoint}"
+        try:
+            with self.session.request(method, url, stream=True, timeout=5) as response:
+                length = int(response.headers.get("Content-Length") or 0)
+                if 0 < length <= STREAM_RESPONSE_BYTES:
+                    self.post_to_ui(self.show_response, response.json())
+                    return
+                
+                if response.encoding is None:
+                    response.encoding = "utf-8"
+                self.post_to_ui(self.response_text.delete, "1.0", tk.END)
+                for chunk in response.iter_content(chunk_size=4096, decode_unicode=True):
+                    self.post_to_ui(self.response_text.insert, tk.END, chunk)
+                self.post_to_ui(self._trim_log, self.response_text)
+        except Exception as e:
+            self.post_to_ui(self.show_response, {"error": str(e)})
+    
+    def show_response(self, result):
+        """Render an API response in the API tab"""
         self.response_text.delete(1.0, tk.END)
         self.response_text.insert(tk.END, json.dumps(result, indent=2))
     
@@ -990,13 +1504,17 @@ class AdminPanel:
     def clear_all_sessions(self):
         """Clear all sessions"""
         if messagebox.askyesno("Confirm", "Delete ALL sessions? This cannot be undone."):
-            result = self.api_request("/admin/clear-sessions?pin=" + self.config["admin_pin"], "POST")
-            if "error" not in result:
-                messagebox.showinfo("Success", "All sessions cleared!")
-                self.load_sessions()
-                self.log_activity("Cleared all sessions")
-            else:
-                messagebox.showerror("Error", result.get("error", "Failed"))
+            request = partial(self.api_request, params={"pin": self.config["admin_pin"]})
+            self.run_async(request, self.on_sessions_cleared, "/admin/clear-sessions", "POST")
+    
+    def on_sessions_cleared(self, result):
+        """Handle clear_all_sessions response"""
+        if "error" not in result:
+            messagebox.showinfo("Success", "All sessions cleared!")
+            self.load_sessions()
+            self.log_activity("Cleared all sessions")
+        else:
+            messagebox.showerror("Error", result.get("error", "Failed"))
     
     def export_analytics(self):
         """Export analytics report"""
@@ -1005,11 +1523,13 @@ class AdminPanel:
             filetypes=[("JSON", "*.json"), ("CSV", "*.csv")]
         )
         if filepath:
-            stats = self.api_request("/db/stats")
-            with open(filepath, "w") as f:
-                json.dump(stats, f, indent=2)
-            messagebox.showinfo("Exported", f"Analytics exported to {filepath}")
-            self.log_activity("Exported analytics")
+            def write(stats):
+                with open(filepath, "w") as f:
+                    json.dump(stats, f, indent=2)
+                messagebox.showinfo("Exported", f"Analytics exported to {filepath}")
+                self.log_activity("Exported analytics")
+            
+            self.run_async(self.api_request, write, "/db/stats")
     
     def export_sessions(self):
         """Export all sessions"""
@@ -1018,16 +1538,24 @@ class AdminPanel:
             filetypes=[("JSON", "*.json")]
         )
         if filepath:
-            sessions = self.api_request("/sessions")
-            with open(filepath, "w") as f:
-                json.dump(sessions, f, indent=2)
-            messagebox.showinfo("Exported", f"Sessions exported to {filepath}")
+            def done(error):
+                if error:
+                    messagebox.showerror("Export Failed", error)
+                else:
+                    messagebox.showinfo("Exported", f"Sessions exported to {filepath}")
+            
+            # Streamed to disk - the sessions are never held in memory here
+            self.run_async(self.api_stream, done, "/sessions/export", filepath, on_error=done)
     
     def start_server_process(self):
         """Start the backend server"""
+        # Check if running
+        self.run_async(self.api_request, self.launch_server, "/")
+    
+    def launch_server(self, status):
+        """Launch uvicorn unless the status check shows the server is up"""
         try:
-            # Check if running
-            if self.api_request("/").get("status") == "online":
+            if status.get("status") == "online":
                 messagebox.showinfo("Start Server", "Server is already running!")
                 return
 
@@ -1059,10 +1587,8 @@ class AdminPanel:
             self.log_activity("Restarting server...")
             
             # Stop if running
-            try:
-                self.api_request("/admin/shutdown?pin=" + self.config["admin_pin"], "POST")
-            except:
-                pass
+            self.executor.submit(self.api_request, "/admin/shutdown", "POST",
+                                 params={"pin": self.config["admin_pin"]})
                 
             # Wait a bit then start
             self.root.after(3000, self.start_server_process)
@@ -1071,14 +1597,17 @@ class AdminPanel:
         """Emergency stop server"""
         if messagebox.askyesno("Emergency Stop", "This will attempt to STOP the backend server. Continue?"):
             self.log_activity("Sending shutdown command...")
-            result = self.api_request("/admin/shutdown?pin=" + self.config["admin_pin"], "POST")
-            
-            if "error" not in result:
-                messagebox.showwarning("Shutdown", "Server is shutting down.\nYou will need to restart it manually.")
-                self.update_status("Disconnected", False)
-                self.log_activity("Server shutdown confirmed")
-            else:
-                messagebox.showerror("Error", f"Failed to stop server: {result.get('error')}")
+            request = partial(self.api_request, params={"pin": self.config["admin_pin"]})
+            self.run_async(request, self.on_shutdown, "/admin/shutdown", "POST")
+    
+    def on_shutdown(self, result):
+        """Handle emergency_stop response"""
+        if "error" not in result:
+            messagebox.showwarning("Shutdown", "Server is shutting down.\nYou will need to restart it manually.")
+            self.update_status("Disconnected", False)
+            self.log_activity("Server shutdown confirmed")
+        else:
+            messagebox.showerror("Error", f"Failed to stop server: {result.get('error')}")
     
     def backup_database(self):
         """Backup database"""
@@ -1088,22 +1617,22 @@ class AdminPanel:
             filetypes=[("JSON", "*.json")]
         )
         if filepath:
-            # Get all data
-            sessions = self.api_request("/sessions")
-            stats = self.api_request("/db/stats")
-            
-            backup = {
-                "timestamp": self.get_timestamp(),
-                "sessions": sessions,
-                "stats": stats,
-                "config": self.config
-            }
-            
-            with open(filepath, "w") as f:
-                json.dump(backup, f, indent=2)
+            def write(results):
+                backup = {
+                    "timestamp": self.get_timestamp(),
+                    "sessions": results["/sessions"],
+                    "stats": results["/db/stats"],
+                    "config": self.config
+                }
+                
+                with open(filepath, "w") as f:
+                    json.dump(backup, f, indent=2)
+                
+                messagebox.showinfo("Backup", f"Backup saved to {filepath}")
+                self.log_activity("Database backed up")
             
-            messagebox.showinfo("Backup", f"Backup saved to {filepath}")
-            self.log_activity("Database backed up")
+            # Get all data
+            self.fetch_many(["/sessions", "/db/stats"], write)
     
     def restore_backup(self):
         """Restore from backup"""
@@ -1118,26 +1647,64 @@ class AdminPanel:
     
     def view_server_logs(self):
         """View server logs"""
-        self.notebook.select(8)  # Switch to tools tab
-        self.tools_log.insert(tk.END, f"[{self.get_timestamp()}] Viewing server logs...\n")
+        self.select_tab(8)  # Switch to tools tab
+        self._buffered_log("tools_log", f"[{self.get_timestamp()}] Viewing server logs...\n")
     
     def check_ports(self):
         """Check common ports"""
         ports = [8000, 3000, 80, 443, 5000]
-        results = []
-        
-        for port in ports:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('localhost', port))
+        self.run_async(self.scan_ports, self.show_port_results, ports, on_error=self.show_port_error)
+    
+    def scan_ports(self, ports, timeout=1.0):
+        """Probe ports on localhost together, all sharing one deadline (runs on one worker)"""
+        results = {}
+        pending = {}
+        # Windows reports a non-blocking connect in progress as WSAEWOULDBLOCK
+        in_progress = {errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)}
+        selector = selectors.DefaultSelector()
+        try:
+            # Start every connect without blocking, then wait for them as a group
+            for port in ports:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                result = sock.connect_ex(('localhost', port))
+                if result in in_progress:
+                    pending[sock] = port
+                    selector.register(sock, selectors.EVENT_WRITE)
+                else:
+                    results[port] = result
+                    sock.close()
+            
+            deadline = time.monotonic() + timeout
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    sock = key.fileobj
+                    results[pending.pop(sock)] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    selector.unregister(sock)
+                    sock.close()
+            
+            # Still connecting at the deadline counts as closed, like a timed-out connect
+            for sock, port in pending.items():
+                results[port] = errno.ETIMEDOUT
+                sock.close()
+        finally:
+            selector.close()
+        return [(port, results[port]) for port in ports]
+    
+    def show_port_results(self, results):
+        """Write a port scan to the tools log"""
+        lines = [f"\n[{self.get_timestamp()}] Port Scan Results:\n"]
+        for port, result in results:
             status = "OPEN" if result == 0 else "CLOSED"
-            results.append(f"Port {port}: {status}")
-            sock.close()
-        
-        self.tools_log.insert(tk.END, f"\n[{self.get_timestamp()}] Port Scan Results:\n")
-        for r in results:
-            self.tools_log.insert(tk.END, f"  {r}\n")
-        self.tools_log.see(tk.END)
+            lines.append(f"  Port {port}: {status}\n")
+        self._buffered_log("tools_log", "".join(lines))
+    
+    def show_port_error(self, error):
+        """Write a failed port scan to the tools log"""
+        self._buffered_log("tools_log", f"\n[{self.get_timestamp()}] Port scan failed: {error}\n")
     
     def show_network_info(self):
         """Show network information"""
@@ -1148,8 +1715,7 @@ Local IP: {self.get_local_ip()}
 API URL: {self.config['api_url']}
 Hostname: {socket.gethostname()}
 """
-        self.tools_log.insert(tk.END, f"\n[{self.get_timestamp()}]{info}")
-        self.tools_log.see(tk.END)
+        self._buffered_log("tools_log", f"\n[{self.get_timestamp()}]{info}")
     
     def change_pin(self):
         """Change admin PIN"""
@@ -1159,23 +1725,35 @@ Hostname: {socket.gethostname()}
         if current == self.config["admin_pin"]:
             if len(new) >= 4:
                 self.config["admin_pin"] = new
-                self.save_config()
-                messagebox.showinfo("Success", "PIN changed successfully!")
-                self.current_pin.delete(0, tk.END)
-                self.new_pin.delete(0, tk.END)
-                self.security_log.insert(tk.END, f"[{self.get_timestamp()}] PIN changed\n")
+                self.save_config(on_saved=self.on_pin_saved)
             else:
                 messagebox.showerror("Error", "New PIN must be at least 4 characters")
         else:
             messagebox.showerror("Error", "Current PIN is incorrect")
-            self.security_log.insert(tk.END, f"[{self.get_timestamp()}] Failed PIN change attempt\n")
+            self._buffered_log("security_log", f"[{self.get_timestamp()}] Failed PIN change attempt\n")
+    
+    def on_pin_saved(self, error):
+        """Report the outcome of change_pin"""
+        if error is None:
+            messagebox.showinfo("Success", "PIN changed successfully!")
+            self.current_pin.delete(0, tk.END)
+            self.new_pin.delete(0, tk.END)
+            self._buffered_log("security_log", f"[{self.get_timestamp()}] PIN changed\n")
+        else:
+            self.on_config_error(error)
     
     def set_default_model(self, model_id):
         """Set default model"""
         self.config["default_model"] = model_id
-        self.save_config()
-        messagebox.showinfo("Model", f"Default model set to:\n{model_id}")
-        self.log_activity(f"Default model changed to {model_id}")
+        self.save_config(on_saved=partial(self.on_model_saved, model_id))
+    
+    def on_model_saved(self, model_id, error):
+        """Report the outcome of set_default_model"""
+        if error is None:
+            messagebox.showinfo("Model", f"Default model set to:\n{model_id}")
+            self.log_activity(f"Default model changed to {model_id}")
+        else:
+            self.on_config_error(error)
     
     def generate_report(self):
         """Generate analytics report"""
@@ -1189,31 +1767,140 @@ Hostname: {socket.gethostname()}
         self.config["admin_pin"] = self.admin_pin_entry.get()
         self.config["auto_refresh"] = self.auto_refresh_var.get()
         self.config["refresh_interval"] = int(self.refresh_interval_entry.get())
-        self.config["temperature"] = float(self.temp_scale.get())
-        self.config["max_tokens"] = int(self.max_tokens_entry.get())
+        if hasattr(self, 'temp_scale'):  # Models tab has been opened
+            self.config["temperature"] = float(self.temp_scale.get())
+            self.config["max_tokens"] = int(self.max_tokens_entry.get())
         
-        self.save_config()
-        messagebox.showinfo("Saved", "All settings saved successfully!")
-        self.log_activity("Settings saved")
+        self.save_config(on_saved=self.on_settings_saved)
+    
+    def on_settings_saved(self, error):
+        """Report the outcome of save_settings"""
+        if error is None:
+            messagebox.showinfo("Saved", "All settings saved successfully!")
+            self.log_activity("Settings saved")
+        else:
+            self.on_config_error(error)
     
-    def save_config(self):
-        """Save config to file"""
-        config_path = os.path.join(os.path.dirname(__file__), "admin_config.json")
-        with open(config_path, "w") as f:
-            json.dump(self.config, f, indent=2)
+    def on_config_error(self, error):
+        """Report a failed config write"""
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to save settings:\n{error}")
+    
+    def save_config(self, on_saved=None):
+        """Save config to file (written on the worker pool)"""
+        self._config_version += 1
+        future = self.executor.submit(self._write_config, dict(self.config), self._config_version)
+        callback = on_saved or self.on_config_error
+        # Cancelled only at close(), which writes the latest config itself
+        future.add_done_callback(lambda f: f.cancelled() or self.post_to_ui(callback, f.exception()))
+    
+    def _write_config(self, config, version):
+        """Atomically replace the config file, unless a newer snapshot already landed"""
+        with self._config_lock:
+            if version < self._config_written:
+                return
+            payload = json.dumps(config, indent=2).encode("utf-8")
+            digest = hashlib.sha1(payload).digest()
+            if digest != self._config_hash:
+                tmp_path = CONFIG_PATH + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, CONFIG_PATH)
+                self._config_hash = digest
+            self._config_written = version
     
     def load_config(self):
-        """Load config from file"""
-        config_path = os.path.join(os.path.dirname(__file__), "admin_config.json")
-        if os.path.exists(config_path):
-            with open(config_path, "r") as f:
-                self.config.update(json.load(f))
+        """Load config from file (once, at startup - self.config is the cache)"""
+        if os.path.exists(CONFIG_PATH):
+            with open(CONFIG_PATH, "rb") as f:
+                data = f.read()
+            self.config.update(json.loads(data))
+            self._config_hash = hashlib.sha1(data).digest()
     
     def auto_refresh(self):
-        """Auto-refresh stats"""
-        if self.config["auto_refresh"]:
-            self.refresh_stats()
-        self.root.after(self.config["refresh_interval"], self.auto_refresh)
+        """Start the live-update worker"""
+        # The worker can't ask Tk for the window state, so track it from map events
+        self.root.bind("<Unmap>", self._on_window_unmap, add="+")
+        self.root.bind("<Map>", self._on_window_map, add="+")
+        threading.Thread(target=self._sse_loop, name="adminevents", daemon=True).start()
+    
+    def _on_window_unmap(self, event):
+        if event.widget is self.root:
+            self._window_shown.clear()
+    
+    def _on_window_map(self, event):
+        if event.widget is self.root and not self._window_shown.is_set():
+            self._window_shown.set()
+            # Catch up on whatever changed while minimized
+            if self.config["auto_refresh"]:
+                self.refresh_stats()
+    
+    def _sse_loop(self):
+        """Follow the server's /events stream, falling back to conditional polling"""
+        backoff = 1
+        while not self._stop_event.is_set():
+            if not self.config["auto_refresh"] or not self._window_shown.is_set():
+                self._stop_event.wait(1)
+                continue
+            try:
+                if self._events_supported:
+                    self._follow_events()
+                else:
+                    self._poll_stats()
+                    self._stop_event.wait(self.config["refresh_interval"] / 1000)
+                backoff = 1
+            except Exception as e:
+                self.post_to_ui(self.on_events_error, str(e))
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 60)
+    
+    def _follow_events(self):
+        """Read server-sent events until the stream ends or auto-refresh is turned off"""
+        url = f"{self.config['api_url']}/events"
+        # The server sends a keep-alive comment every 15s, so a 30s read timeout means a dead link
+        with self.session.get(url, stream=True, timeout=(5, 30)) as response:
+            if response.status_code == 404:
+                self._events_supported = False
+                return
+            response.raise_for_status()
+            
+            for line in response.iter_lines(decode_unicode=True):
+                if (self._stop_event.is_set() or not self.config["auto_refresh"]
+                        or not self._window_shown.is_set()):
+                    return
+                if line and line.startswith("data:"):
+                    self.post_to_ui(self._apply_event, json.loads(line[5:]))
+        
+        # Server closed the stream - pause briefly before reconnecting
+        self._stop_event.wait(1)
+    
+    def _poll_stats(self):
+        """Conditional GET of /db/stats - a 304 means nothing changed"""
+        if not HAS_REQUESTS:
+            db_stats = self.api_request("/db/stats")
+            if "error" in db_stats:
+                raise ConnectionError(db_stats["error"])
+            self.post_to_ui(self._apply_event, {"type": "stats", **db_stats})
+            return
+        
+        headers = {"If-None-Match": self._etag} if self._etag else {}
+        response = self.session.get(f"{self.config['api_url']}/db/stats",
+                                    headers=headers, timeout=5)
+        if response.status_code == 304:
+            return
+        response.raise_for_status()
+        self._etag = response.headers.get("ETag")
+        self.post_to_ui(self._apply_event, {"type": "stats", **response.json()})
+    
+    def _apply_event(self, event):
+        """Apply a live-update event to the dashboard"""
+        if event.get("type") == "stats":
+            self.update_stats({"status": "online"}, event)
+    
+    def on_events_error(self, error):
+        """Handle a failed live-update connection"""
+        self.update_status("Disconnected", False)
+        self.log_activity(f"Connection error: {error}")
 
 
 def main():
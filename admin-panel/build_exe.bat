@@ -15,6 +15,9 @@ if %errorlevel% neq 0 (
 REM Install requests for better API handling
 pip install requests
 
+REM Optional: incremental JSON parsing for large session lists
+pip install ijson
+
 echo.
 echo Building admin_panel.exe...
 echo.
@@ -4,26 +4,48 @@ A comprehensive chatbot API with multi-modal input support.
 """
 
 import os
+import json
+import asyncio
 import base64
 import time
 import uuid
 import threading
 import sys
 import hashlib
+import hmac
+import signal
 from datetime import datetime
-from typing import Optional, Dict, List, Any
-from collections import defaultdict
+from typing import Optional, Dict, List, Any, Deque
+from collections import deque, OrderedDict
+from itertools import islice
 
-from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import httpx
+import bcrypt
+import orjson
 from dotenv import load_dotenv
 
+# HTTP/2 for OpenRouter needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 # Load environment variables
 load_dotenv()
 
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson - faster, and encodes straight to bytes."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 # Import database
 import database as db
 
@@ -33,7 +55,8 @@ app = FastAPI(
     description="Multi-modal AI chatbot with text, voice, and image support",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url=None
+    redoc_url=None,
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration
@@ -52,14 +75,72 @@ app.add_middleware(
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 DEFAULT_MODEL = "deepseek/deepseek-chat"
+REASONING_MODEL_PREFIXES = ("nvidia/nemotron", "deepseek/deepseek-r1")  # models that accept "reasoning"
+
+# Shared OpenRouter client - created on startup, reuses pooled keep-alive connections
+openrouter_client: Optional[httpx.AsyncClient] = None
 
 # Rate limiting configuration
-RATE_LIMIT_REQUESTS = 10  # requests per window
+RATE_LIMIT_REQUESTS = 10  # requests per window (also the burst size)
 RATE_LIMIT_WINDOW = 60  # seconds
+RATE_LIMIT_REFILL = RATE_LIMIT_REQUESTS / RATE_LIMIT_WINDOW  # tokens per second
 
-# Session storage (in-memory - use Redis for production)
-sessions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-rate_limit_store: Dict[str, List[float]] = defaultdict(list)
+# Server-sent events (admin panel live updates)
+EVENTS_POLL_INTERVAL = 2  # seconds between database checks
+EVENTS_KEEPALIVE = 15  # seconds between keep-alive comments
+
+# Sessions read from the database per chunk of /sessions/export
+EXPORT_PAGE_SIZE = 500
+
+# In-memory session cache bounds and rate limiter cleanup
+MAX_SESSIONS = 1000  # least recently used histories are dropped beyond this
+SESSION_HISTORY_LIMIT = 50  # messages kept per cached history
+RATE_LIMIT_SWEEP_INTERVAL = 60  # seconds between sweeps of idle clients
+
+
+class SessionStore(OrderedDict):
+    """Chat histories keyed by session ID, keeping the most recently used MAX_SESSIONS.
+    
+    The database is the source of truth: a history that isn't cached (evicted,
+    server restarted, or written by another worker) is reloaded by load_history.
+    """
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+# Image uploads: accepted types, size cap, and read size (a multiple of 3, so base64 chunks concatenate cleanly)
+ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/gif", "image/webp"]
+UPLOAD_MAX_BYTES = 10 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 65532
+
+# Successful logins are remembered briefly so repeat logins skip bcrypt and the database
+LOGIN_CACHE_TTL = 60  # seconds
+LOGIN_CACHE_SIZE = 1024
+
+# Deterministic (temperature ~0) completions are cached, keyed on the exact request
+COMPLETION_CACHE_MAX_TEMPERATURE = 0.01
+COMPLETION_CACHE_TTL = 3600  # seconds
+COMPLETION_CACHE_SIZE = 512
+
+# Longest full_reasoning kept, returned and stored per answer
+MAX_REASONING_CHARS = 20000
+
+# Session storage (in-memory LRU in front of the database)
+sessions: Dict[str, Deque[Dict[str, Any]]] = SessionStore(MAX_SESSIONS)
+rate_limit_store: Dict[str, List[float]] = {}  # client IP -> [tokens, last refill (monotonic)]
 
 # =============================================================================
 # Models
@@ -102,25 +183,117 @@ class RegisterRequest(BaseModel):
 # =============================================================================
 
 def check_rate_limit(client_ip: str) -> bool:
-    """Check if client has exceeded rate limit."""
-    current_time = time.time()
-    window_start = current_time - RATE_LIMIT_WINDOW
-    
-    # Clean old entries
-    rate_limit_store[client_ip] = [
-        t for t in rate_limit_store[client_ip] if t > window_start
-    ]
+    """Check if client has exceeded rate limit (token bucket)."""
+    now = time.monotonic()
+    bucket = rate_limit_store.get(client_ip)
+    if bucket is None:
+        bucket = rate_limit_store[client_ip] = [float(RATE_LIMIT_REQUESTS), now]
     
-    if len(rate_limit_store[client_ip]) >= RATE_LIMIT_REQUESTS:
+    # Refill for the time since the last request, up to a full burst
+    tokens = min(RATE_LIMIT_REQUESTS, bucket[0] + (now - bucket[1]) * RATE_LIMIT_REFILL)
+    bucket[1] = now
+    if tokens < 1:
+        bucket[0] = tokens
         return False
     
-    rate_limit_store[client_ip].append(current_time)
+    bucket[0] = tokens - 1
     return True
 
+async def sweep_rate_limits():
+    """Periodically drop clients idle long enough that their bucket is full again."""
+    while True:
+        await asyncio.sleep(RATE_LIMIT_SWEEP_INTERVAL)
+        cutoff = time.monotonic() - RATE_LIMIT_WINDOW
+        stale = [ip for ip, (_, last) in rate_limit_store.items() if last <= cutoff]
+        for ip in stale:
+            del rate_limit_store[ip]
+
+@app.on_event("startup")
+async def start_rate_limit_sweeper():
+    app.state.rate_limit_sweeper = asyncio.create_task(sweep_rate_limits())
+
+@app.on_event("shutdown")
+async def stop_rate_limit_sweeper():
+    app.state.rate_limit_sweeper.cancel()
+
+# =============================================================================
+# Authentication
+# =============================================================================
+
+# (email, sha256 of password) -> (expires at, user)
+login_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+login_cache_lock = threading.Lock()  # authenticate runs in worker threads
+
+def hash_password(password: str) -> str:
+    """bcrypt hash with a per-user salt (bcrypt only uses the first 72 bytes)."""
+    return bcrypt.hashpw(password.encode()[:72], bcrypt.gensalt()).decode()
+
+def check_password(user: Dict[str, Any], password: str) -> bool:
+    """Check a password, upgrading legacy unsalted SHA-256 hashes to bcrypt on success."""
+    stored = user["password"]
+    if stored.startswith("$2"):
+        return bcrypt.checkpw(password.encode()[:72], stored.encode())
+    
+    # Compare raw 32-byte digests in constant time rather than hex strings with !=
+    try:
+        legacy = bytes.fromhex(stored)
+    except ValueError:
+        return False
+    if not hmac.compare_digest(legacy, hashlib.sha256(password.encode()).digest()):
+        return False
+    db.update_user_password(user["id"], hash_password(password))
+    return True
+
+def authenticate(email: str, password: str) -> Optional[Dict[str, Any]]:
+    """Verify credentials, serving repeat logins from login_cache."""
+    key = (email, hashlib.sha256(password.encode()).digest())
+    now = time.monotonic()
+    with login_cache_lock:
+        cached = login_cache.get(key)
+    if cached and cached[0] > now:
+        db.record_login(cached[1]["id"])  # still a real login - skip only bcrypt and the lookup
+        return cached[1]
+    
+    user = db.get_user_by_email(email)
+    if not user or not check_password(user, password):
+        return None
+    
+    del user["password"]  # never hand the hash back to the client
+    db.record_login(user["id"])
+    with login_cache_lock:
+        login_cache[key] = (now + LOGIN_CACHE_TTL, user)
+        login_cache.move_to_end(key)
+        if len(login_cache) > LOGIN_CACHE_SIZE:
+            login_cache.popitem(last=False)
+    return user
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+def extract_tag(text: str, tag: str) -> Optional[str]:
+    """Return the stripped text inside the first <tag>...</tag> pair, or None."""
+    open_tag = f"<{tag}>"
+    start = text.find(open_tag)
+    if start < 0:
+        return None
+    start += len(open_tag)
+    end = text.find(f"</{tag}>", start)
+    if end < 0:
+        return None
+    return text[start:end].strip()
+
+async def read_base64(file: UploadFile, max_bytes: int) -> str:
+    """Base64-encode an upload chunk by chunk, rejecting it as soon as it passes max_bytes."""
+    encoded = bytearray()
+    total = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(status_code=400, detail="File too large. Max size: 10MB")
+        encoded += base64.b64encode(chunk)
+    return encoded.decode("ascii")
+
 def sanitize_input(text: str) -> str:
     """Sanitize user input to prevent injection attacks."""
     if not text:
@@ -134,19 +307,8 @@ def generate_session_id() -> str:
     """Generate a unique session ID."""
     return str(uuid.uuid4())
 
-def build_messages_with_history(
-    session_id: str,
-    user_message: str,
-    image_data: Optional[str] = None,
-    image_type: Optional[str] = None
-) -> List[Dict[str, Any]]:
-    """Build message array including conversation history with reasoning support."""
-    
-    # Get current date/time for the AI
-    current_datetime = datetime.now().strftime("%A, %B %d, %Y at %I:%M %p")
-    
-    # System prompt with current date
-    system_prompt = f"""You are Nao AI, an intelligent AI assistant. Be helpful, accurate, and thorough in your responses.
+# System prompt (with the current date) as last built, and the minute it was built for
+SYSTEM_PROMPT_TEMPLATE = """You are Nao AI, an intelligent AI assistant. Be helpful, accurate, and thorough in your responses.
 
 IMPORTANT - Current Date and Time: {current_datetime}
 
@@ -155,12 +317,44 @@ When analyzing problems:
 - Consider multiple perspectives  
 - Provide clear, well-structured answers
 - Always use the current date above when discussing dates or time"""
+system_prompt_cache: Dict[str, Any] = {"minute": None, "message": None}
 
-    messages = [{"role": "system", "content": system_prompt}]
+def get_system_message() -> Dict[str, str]:
+    """System prompt message, rebuilt only when the minute it shows changes."""
+    now = datetime.now()
+    minute = now.replace(second=0, microsecond=0)
+    if minute != system_prompt_cache["minute"]:
+        current_datetime = now.strftime("%A, %B %d, %Y at %I:%M %p")
+        system_prompt_cache["message"] = {
+            "role": "system",
+            "content": SYSTEM_PROMPT_TEMPLATE.format(current_datetime=current_datetime)
+        }
+        system_prompt_cache["minute"] = minute
+    return system_prompt_cache["message"]
+
+async def load_history(session_id: str) -> Deque[Dict[str, Any]]:
+    """Get a session's cached history, reading it from the database (off the event loop) if needed."""
+    if session_id not in sessions:
+        rows = await asyncio.to_thread(db.get_recent_messages, session_id, SESSION_HISTORY_LIMIT)
+        # Another request may have filled it while we waited
+        if session_id not in sessions:
+            sessions[session_id] = deque(rows, maxlen=SESSION_HISTORY_LIMIT)
+    return sessions[session_id]
+
+def build_messages_with_history(
+    history: Deque[Dict[str, Any]],
+    user_message: str,
+    image_data: Optional[str] = None,
+    image_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Build message array including conversation history with reasoning support."""
+    
+    messages = [get_system_message()]
     
     # Add conversation history (last 10 exchanges) with reasoning_details preserved
-    history = sessions.get(session_id, [])[-20:]  # 20 messages = 10 exchanges
+    history = islice(history, max(len(history) - 20, 0), None)  # 20 messages = 10 exchanges
     for msg in history:
+        # History is text-only; had_image and similar markers stay local
         message_obj = {"role": msg["role"], "content": msg["content"]}
         # Preserve reasoning_details if present (for continuity)
         if "reasoning_details" in msg and msg["reasoning_details"]:
@@ -175,7 +369,7 @@ When analyzing problems:
             {
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:{image_type};base64,{image_data}"
+                    "url": "".join(("data:", image_type, ";base64,", image_data))
                 }
             }
         ]
@@ -185,6 +379,29 @@ When analyzing problems:
     
     return messages
 
+def merge_reasoning_details(fragments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge streamed reasoning_details fragments into one detail per index and type."""
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for fragment in fragments:
+        key = (fragment.get("index", 0), fragment.get("type"))
+        detail = merged.get(key)
+        if detail is None:
+            merged[key] = dict(fragment)
+            continue
+        for field, value in fragment.items():
+            # text, summary and data arrive a piece at a time; the rest repeats
+            if isinstance(value, str) and isinstance(detail.get(field), str) and field in ("text", "summary", "data"):
+                detail[field] += value
+            elif detail.get(field) is None:
+                detail[field] = value
+    return list(merged.values())
+
+def reasoning_step_text(step: Any) -> str:
+    """Readable text of one reasoning_details entry (encrypted entries have none)."""
+    if isinstance(step, dict):
+        return step.get("text") or step.get("summary") or step.get("content") or ""
+    return str(step)
+
 def parse_ai_response(response_message: Dict[str, Any]) -> Dict[str, Any]:
     """Parse AI response to extract reasoning and answer from OpenRouter's native reasoning."""
     
@@ -203,47 +420,50 @@ def parse_ai_response(response_message: Dict[str, Any]) -> Dict[str, Any]:
     if reasoning_details:
         # reasoning_details can be a list of reasoning steps or a string
         if isinstance(reasoning_details, list):
-            # Join reasoning steps
-            full_reasoning = "\n".join([
-                step.get("content", str(step)) if isinstance(step, dict) else str(step)
-                for step in reasoning_details
-            ])
-            result["full_reasoning"] = full_reasoning
+            # Join reasoning steps, stopping once MAX_REASONING_CHARS is reached
+            steps = []
+            remaining = MAX_REASONING_CHARS
+            for step in reasoning_details:
+                text = reasoning_step_text(step)
+                if not text:
+                    continue
+                steps.append(text[:remaining])
+                remaining -= len(text) + 1
+                if remaining <= 0:
+                    break
+            result["full_reasoning"] = "\n".join(steps)
             # Create short reasoning from first step or summary
-            if len(reasoning_details) > 0:
-                first_step = reasoning_details[0]
-                if isinstance(first_step, dict):
-                    result["short_reasoning"] = first_step.get("content", "")[:100] + "..."
-                else:
-                    result["short_reasoning"] = str(first_step)[:100] + "..."
+            if steps:
+                result["short_reasoning"] = steps[0][:100] + "..."
         elif isinstance(reasoning_details, str):
-            result["full_reasoning"] = reasoning_details
+            result["full_reasoning"] = reasoning_details[:MAX_REASONING_CHARS]
             result["short_reasoning"] = reasoning_details[:100] + "..." if len(reasoning_details) > 100 else reasoning_details
-    else:
+    elif "<" in content:
         # Fallback: Try to parse XML-style reasoning from content (for models that don't support native reasoning)
-        import re
-        
-        short_match = re.search(r'<short_reasoning>(.*?)</short_reasoning>', content, re.DOTALL)
-        if short_match:
-            result["short_reasoning"] = short_match.group(1).strip()
+        short_reasoning = extract_tag(content, "short_reasoning")
+        if short_reasoning is not None:
+            result["short_reasoning"] = short_reasoning
         
-        full_match = re.search(r'<full_reasoning>(.*?)</full_reasoning>', content, re.DOTALL)
-        if full_match:
-            result["full_reasoning"] = full_match.group(1).strip()
+        full_reasoning = extract_tag(content, "full_reasoning")
+        if full_reasoning is not None:
+            result["full_reasoning"] = full_reasoning
         
-        answer_match = re.search(r'<final_answer>(.*?)</final_answer>', content, re.DOTALL)
-        if answer_match:
-            result["final_answer"] = answer_match.group(1).strip()
+        final_answer = extract_tag(content, "final_answer")
+        if final_answer is not None:
+            result["final_answer"] = final_answer
     
     return result
 
-async def call_openrouter(
+# blake2b of (model, temperature, reasoning flag, hour of the system prompt, non-system messages) -> (expires at, message)
+completion_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+def build_payload(
     messages: List[Dict[str, Any]],
     model: str,
     temperature: float,
-    enable_reasoning: bool = False  # Disabled by default - most free models don't support it
+    enable_reasoning: bool
 ) -> Dict[str, Any]:
-    """Call OpenRouter API."""
+    """Build the OpenRouter chat completion payload."""
     
     if not OPENROUTER_API_KEY:
         raise HTTPException(
@@ -251,13 +471,6 @@ async def call_openrouter(
             detail="API key not configured. Please set OPENROUTER_API_KEY in .env file."
         )
     
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "http://localhost:8000",
-        "X-Title": "AI Chatbot"
-    }
-    
     payload = {
         "model": model,
         "messages": messages,
@@ -266,58 +479,142 @@ async def call_openrouter(
     }
     
     # Only enable reasoning for models that support it (like nemotron)
-    reasoning_models = ["nvidia/nemotron", "deepseek/deepseek-r1"]
-    if enable_reasoning and any(rm in model for rm in reasoning_models):
+    if enable_reasoning and model.startswith(REASONING_MODEL_PREFIXES):
         payload["reasoning"] = {"enabled": True}
     
-    async with httpx.AsyncClient(timeout=180.0) as client:  # Increased timeout
-        try:
-            response = await client.post(
-                f"{OPENROUTER_BASE_URL}/chat/completions",
-                headers=headers,
-                json=payload
-            )
+    return payload
+
+async def call_openrouter(
+    messages: List[Dict[str, Any]],
+    model: str,
+    temperature: float,
+    enable_reasoning: bool = False  # Disabled by default - most free models don't support it
+) -> Dict[str, Any]:
+    """Call OpenRouter API."""
+    
+    payload = build_payload(messages, model, temperature, enable_reasoning)
+    
+    cache_key = None
+    if temperature <= COMPLETION_CACHE_MAX_TEMPERATURE:
+        # The system prompt embeds the current minute, so key on its date and hour
+        # instead; an answer is never reused once the hour it was given in is over
+        conversation = messages[1:] if messages and messages[0]["role"] == "system" else messages
+        prompt_hour = datetime.now().strftime("%Y-%m-%d %H")
+        cache_key = hashlib.blake2b(
+            orjson.dumps([model, float(temperature), enable_reasoning, prompt_hour, conversation]), digest_size=16
+        ).digest()
+        cached = completion_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            completion_cache.move_to_end(cache_key)
+            return cached[1]
+    
+    try:
+        response = await openrouter_client.post("/chat/completions", json=payload)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        
+        # Return the full message object (includes reasoning_details if available)
+        message = data["choices"][0]["message"]
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="Request timed out. The model may be slow to respond.")
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"API error: {e.response.text}"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if cache_key is not None:
+        completion_cache[cache_key] = (time.monotonic() + COMPLETION_CACHE_TTL, message)
+        completion_cache.move_to_end(cache_key)
+        if len(completion_cache) > COMPLETION_CACHE_SIZE:
+            completion_cache.popitem(last=False)
+    return message
+
+async def stream_openrouter(
+    messages: List[Dict[str, Any]],
+    model: str,
+    temperature: float,
+    enable_reasoning: bool = False
+):
+    """Call OpenRouter with stream=True, yielding each delta as it arrives."""
+    
+    payload = build_payload(messages, model, temperature, enable_reasoning)
+    payload["stream"] = True
+    
+    async with openrouter_client.stream("POST", "/chat/completions", json=payload) as response:
+        if response.is_error:
+            await response.aread()
             response.raise_for_status()
-            data = response.json()
-            
-            # Return the full message object (includes reasoning_details if available)
-            return data["choices"][0]["message"]
-        except httpx.TimeoutException:
-            raise HTTPException(status_code=504, detail="Request timed out. The model may be slow to respond.")
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"API error: {e.response.text}"
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        async for line in response.aiter_lines():
+            # Skip blank separators and ": OPENROUTER PROCESSING" comments
+            if not line.startswith("data: "):
+                continue
+            data = line[6:]
+            if data == "[DONE]":
+                break
+            chunk = orjson.loads(data)
+            if "error" in chunk:
+                raise HTTPException(status_code=502, detail=f"API error: {chunk['error']}")
+            if chunk.get("choices"):
+                yield chunk["choices"][0].get("delta") or {}
+
+@app.on_event("startup")
+async def open_openrouter_client():
+    global openrouter_client
+    openrouter_client = httpx.AsyncClient(
+        base_url=OPENROUTER_BASE_URL,
+        headers={
+            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "http://localhost:8000",
+            "X-Title": "AI Chatbot"
+        },
+        timeout=180.0,
+        http2=HAS_HTTP2,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+
+@app.on_event("shutdown")
+async def close_openrouter_client():
+    await openrouter_client.aclose()
+
+@app.on_event("shutdown")
+async def close_database():
+    db.close_connection()
 
 # =============================================================================
 # API Endpoints
 # =============================================================================
 
+# Static response bodies, serialized once at import instead of on every poll
+ROOT_BODY = orjson.dumps({"status": "online", "message": "Nao AI API is running"})
+SETTINGS_BODY = orjson.dumps({
+    "available_models": [
+        {"id": "nvidia/nemotron-3-nano-30b-a3b:free", "name": "Nemotron Nano 30B"},
+        {"id": "kwaipilot/kat-coder-pro:free", "name": "Kat Coder Pro"},
+    ],
+    "default_model": "nvidia/nemotron-3-nano-30b-a3b:free",
+    "default_temperature": 0.7
+})
+HEALTH_STATIC = {"status": "healthy", "api_key_configured": bool(OPENROUTER_API_KEY)}
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
-    return {"status": "online", "message": "Nao AI API is running"}
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 @app.get("/settings", response_model=SettingsResponse)
 async def get_settings():
     """Get available settings and models."""
-    return {
-        "available_models": [
-            {"id": "nvidia/nemotron-3-nano-30b-a3b:free", "name": "Nemotron Nano 30B"},
-            {"id": "kwaipilot/kat-coder-pro:free", "name": "Kat Coder Pro"},
-        ],
-        "default_model": "nvidia/nemotron-3-nano-30b-a3b:free",
-        "default_temperature": 0.7
-    }
+    return Response(content=SETTINGS_BODY, media_type="application/json")
 
 @app.post("/auth/register")
 async def register(req: RegisterRequest):
     """Register a new user."""
-    # Hash password (simple SHA256)
-    pwd_hash = hashlib.sha256(req.password.encode()).hexdigest()
+    # bcrypt is deliberately slow - keep it off the event loop
+    pwd_hash = await asyncio.to_thread(hash_password, req.password)
     user = db.create_user(req.email, pwd_hash, req.name)
     if not user:
         raise HTTPException(status_code=400, detail="Email already registered")
@@ -326,8 +623,7 @@ async def register(req: RegisterRequest):
 @app.post("/auth/login")
 async def login(req: LoginRequest):
     """Login a user."""
-    pwd_hash = hashlib.sha256(req.password.encode()).hexdigest()
-    user = db.verify_user(req.email, pwd_hash)
+    user = await asyncio.to_thread(authenticate, req.email, req.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     return {"success": True, "user": user}
@@ -384,6 +680,8 @@ async def admin_clear_sessions(pin: str = ""):
     if pin != ADMIN_PIN:
         raise HTTPException(status_code=401, detail="Invalid admin PIN")
     
+    # Deleted sessions' messages are not reloaded as context, even if an id is reused
+    db.delete_all_sessions()
     sessions.clear()
     return {"success": True, "message": "All sessions cleared"}
 
@@ -393,12 +691,13 @@ async def admin_shutdown(pin: str = ""):
     if pin != ADMIN_PIN:
         raise HTTPException(status_code=401, detail="Invalid admin PIN")
     
-    def shutdown():
-        time.sleep(1)
+    async def shutdown():
+        await asyncio.sleep(1)
         print("Server shutting down via Admin Panel...")
-        os._exit(0)
-        
-    threading.Thread(target=shutdown).start()
+        # Let uvicorn exit normally so the shutdown handlers close the client and database
+        signal.raise_signal(signal.SIGTERM)
+    
+    app.state.shutdown_task = asyncio.create_task(shutdown())
     return {"status": "shutting_down", "message": "Server stopping in 1s..."}
 
 @app.post("/admin/update-settings")
@@ -434,6 +733,27 @@ async def get_sessions(limit: int = 50):
     sessions_list = db.get_all_sessions(limit)
     return {"sessions": sessions_list}
 
+@app.get("/sessions/export")
+async def export_sessions():
+    """Stream every session as one JSON document, a page of rows at a time."""
+    def export_stream():
+        yield '{"sessions": ['
+        offset = 0
+        while True:
+            page = db.get_all_sessions(EXPORT_PAGE_SIZE, offset)
+            if page:
+                yield ("," if offset else "") + ",".join(json.dumps(s) for s in page)
+            if len(page) < EXPORT_PAGE_SIZE:
+                break
+            offset += EXPORT_PAGE_SIZE
+        yield "]}"
+    
+    return StreamingResponse(
+        export_stream(),
+        media_type="application/json",
+        headers={"Content-Disposition": 'attachment; filename="sessions.json"'}
+    )
+
 @app.post("/sessions")
 async def create_session(session_id: str = None, title: str = "New Chat"):
     """Create a new session."""
@@ -456,6 +776,7 @@ async def get_session(session_id: str):
 async def delete_session(session_id: str):
     """Delete a session."""
     db.delete_session(session_id)
+    sessions.pop(session_id, None)
     return {"success": True, "message": "Session deleted"}
 
 @app.get("/sessions/{session_id}/messages")
@@ -465,14 +786,47 @@ async def get_messages(session_id: str, limit: int = 100):
     return {"messages": messages}
 
 @app.get("/db/stats")
-async def get_db_stats():
-    """Get database statistics."""
+async def get_db_stats(request: Request):
+    """Get database statistics (supports If-None-Match)."""
     stats = db.get_stats()
-    return stats
+    etag = '"' + hashlib.sha1(json.dumps(stats, sort_keys=True).encode()).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(content=stats, headers={"ETag": etag})
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: Request, chat_request: ChatRequest):
-    """Main chat endpoint with native reasoning support."""
+@app.get("/events")
+async def stream_events(request: Request):
+    """Stream database statistics as server-sent events, pushed only when they change."""
+    
+    async def event_stream():
+        last_stats = None
+        last_sent = time.time()
+        while not await request.is_disconnected():
+            stats = db.get_stats()
+            if stats != last_stats:
+                last_stats = stats
+                last_sent = time.time()
+                yield f"data: {json.dumps({'type': 'stats', **stats})}\n\n"
+            elif time.time() - last_sent >= EVENTS_KEEPALIVE:
+                last_sent = time.time()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(EVENTS_POLL_INTERVAL)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+async def prepare_chat(
+    request: Request,
+    message: str,
+    session_id: Optional[str],
+    image_data: Optional[str],
+    image_type: Optional[str],
+    image_file: Optional[UploadFile]
+):
+    """Rate-limit and validate a chat turn, returning (session_id, message, model messages)."""
     
     # Get client IP for rate limiting
     client_ip = request.client.host if request.client else "unknown"
@@ -485,34 +839,46 @@ async def chat(request: Request, chat_request: ChatRequest):
         )
     
     # Sanitize input
-    message = sanitize_input(chat_request.message)
+    message = sanitize_input(message)
     if not message:
         raise HTTPException(status_code=400, detail="Message cannot be empty")
     
+    if image_file is not None:
+        image_data = await read_base64(image_file, UPLOAD_MAX_BYTES)
+        image_type = image_file.content_type
+    
     # Get or create session
-    session_id = chat_request.session_id or generate_session_id()
+    session_id = session_id or generate_session_id()
     
     # Build messages with history
     messages = build_messages_with_history(
-        session_id,
+        await load_history(session_id),
         message,
-        chat_request.image_data,
-        chat_request.image_type
-    )
-    
-    # Call AI API with native reasoning enabled
-    response_message = await call_openrouter(
-        messages,
-        chat_request.model or DEFAULT_MODEL,
-        chat_request.temperature or 0.7,
-        enable_reasoning=True
+        image_data,
+        image_type
     )
     
-    # Parse response (handles both native reasoning and XML fallback)
-    parsed = parse_ai_response(response_message)
+    return session_id, message, messages
+
+def record_turn(
+    background_tasks: BackgroundTasks,
+    session_id: str,
+    message: str,
+    parsed: Dict[str, Any],
+    had_image: bool = False
+):
+    """Add a finished turn to the session history and queue its database write."""
     
-    # Save to session history with reasoning_details for continuity
-    sessions[session_id].append({"role": "user", "content": message})
+    # Save to session history with reasoning_details for continuity. Only the
+    # text is kept - an image goes to the model on its own turn, not every turn after.
+    user_message = {"role": "user", "content": message}
+    if had_image:
+        user_message["had_image"] = True
+    # Only update a cached history - if it was evicted meanwhile, the next
+    # load_history reads this turn back from the database
+    history = sessions.get(session_id)
+    if history is not None:
+        history.append(user_message)
     assistant_message = {
         "role": "assistant", 
         "content": parsed["final_answer"]
@@ -520,15 +886,43 @@ async def chat(request: Request, chat_request: ChatRequest):
     # Preserve reasoning_details if available (for multi-turn reasoning)
     if parsed.get("reasoning_details"):
         assistant_message["reasoning_details"] = parsed["reasoning_details"]
-    sessions[session_id].append(assistant_message)
+    if history is not None:
+        history.append(assistant_message)  # bounded deque drops the oldest
     
-    # Limit session history
-    if len(sessions[session_id]) > 50:
-        sessions[session_id] = sessions[session_id][-50:]
+    # Save to database after the response is sent
+    background_tasks.add_task(db.add_messages, session_id, [
+        ("user", message, None, None),
+        ("assistant", parsed["final_answer"], parsed["full_reasoning"], None),
+    ])
+
+async def process_chat(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    message: str,
+    session_id: Optional[str],
+    model: Optional[str],
+    temperature: Optional[float],
+    image_data: Optional[str] = None,
+    image_type: Optional[str] = None,
+    image_file: Optional[UploadFile] = None
+) -> ChatResponse:
+    """Run one chat turn; an image_file is base64-encoded here, once, after the cheap checks."""
     
-    # Save to database
-    db.add_message(session_id, "user", message)
-    db.add_message(session_id, "assistant", parsed["final_answer"], parsed["full_reasoning"])
+    session_id, message, messages = await prepare_chat(
+        request, message, session_id, image_data, image_type, image_file
+    )
+    
+    # Call AI API with native reasoning enabled
+    response_message = await call_openrouter(
+        messages,
+        model or DEFAULT_MODEL,
+        0.7 if temperature is None else temperature,
+        enable_reasoning=True
+    )
+    
+    # Parse response (handles both native reasoning and XML fallback)
+    parsed = parse_ai_response(response_message)
+    record_turn(background_tasks, session_id, message, parsed, isinstance(messages[-1]["content"], list))
     
     return ChatResponse(
         session_id=session_id,
@@ -538,25 +932,127 @@ async def chat(request: Request, chat_request: ChatRequest):
         timestamp=datetime.now().isoformat()
     )
 
+@app.post("/chat", response_model=ChatResponse)
+async def chat(request: Request, chat_request: ChatRequest, background_tasks: BackgroundTasks):
+    """Main chat endpoint with native reasoning support."""
+    return await process_chat(
+        request,
+        background_tasks,
+        chat_request.message,
+        chat_request.session_id,
+        chat_request.model,
+        chat_request.temperature,
+        chat_request.image_data,
+        chat_request.image_type
+    )
+
+@app.post("/chat/stream")
+async def chat_stream(request: Request, chat_request: ChatRequest, background_tasks: BackgroundTasks):
+    """Chat endpoint that relays the answer as server-sent events while the model generates it."""
+    session_id, message, messages = await prepare_chat(
+        request,
+        chat_request.message,
+        chat_request.session_id,
+        chat_request.image_data,
+        chat_request.image_type,
+        None
+    )
+    
+    async def event_stream():
+        yield f"data: {json.dumps({'type': 'session', 'session_id': session_id})}\n\n"
+        content: List[str] = []
+        reasoning: List[str] = []
+        reasoning_fragments: List[Dict[str, Any]] = []
+        try:
+            async for delta in stream_openrouter(
+                messages,
+                chat_request.model or DEFAULT_MODEL,
+                0.7 if chat_request.temperature is None else chat_request.temperature,
+                enable_reasoning=True
+            ):
+                if delta.get("reasoning_details"):
+                    reasoning_fragments.extend(delta["reasoning_details"])
+                if delta.get("reasoning"):
+                    reasoning.append(delta["reasoning"])
+                    yield f"data: {json.dumps({'type': 'reasoning', 'content': delta['reasoning']})}\n\n"
+                if delta.get("content"):
+                    content.append(delta["content"])
+                    yield f"data: {json.dumps({'type': 'content', 'content': delta['content']})}\n\n"
+        except httpx.TimeoutException:
+            yield f"data: {json.dumps({'type': 'error', 'detail': 'Request timed out. The model may be slow to respond.'})}\n\n"
+            return
+        except httpx.HTTPStatusError as e:
+            yield f"data: {json.dumps({'type': 'error', 'detail': f'API error: {e.response.text}'})}\n\n"
+            return
+        except HTTPException as e:
+            yield f"data: {json.dumps({'type': 'error', 'detail': e.detail})}\n\n"
+            return
+        except Exception as e:
+            yield f"data: {json.dumps({'type': 'error', 'detail': str(e)})}\n\n"
+            return
+        
+        # Fragments carry one token each; merge them so history holds whole details
+        reasoning_details = merge_reasoning_details(reasoning_fragments)
+        parsed = parse_ai_response({
+            "content": "".join(content),
+            "reasoning_details": reasoning_details or None
+        })
+        # Plain reasoning text is for display only - reasoning_details stays the
+        # list of detail objects OpenRouter expects back in the history
+        if reasoning and not parsed["full_reasoning"]:
+            full_reasoning = "".join(reasoning)[:MAX_REASONING_CHARS]
+            parsed["full_reasoning"] = full_reasoning
+            parsed["short_reasoning"] = full_reasoning[:100] + "..." if len(full_reasoning) > 100 else full_reasoning
+        # Runs once the stream has been sent, like the /chat background write
+        record_turn(background_tasks, session_id, message, parsed, isinstance(messages[-1]["content"], list))
+        yield f"data: {json.dumps({'type': 'done', **parsed, 'session_id': session_id, 'timestamp': datetime.now().isoformat()})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.post("/chat/image", response_model=ChatResponse)
+async def chat_with_image(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    message: str = Form(...),
+    session_id: Optional[str] = Form(None),
+    model: Optional[str] = Form(DEFAULT_MODEL),
+    temperature: Optional[float] = Form(0.7)
+):
+    """Chat with an attached image, sent as multipart instead of a separate /upload-image round trip."""
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_IMAGE_TYPES)}"
+        )
+    
+    return await process_chat(
+        request,
+        background_tasks,
+        message,
+        session_id,
+        model,
+        temperature,
+        image_file=file
+    )
+
 @app.post("/upload-image")
 async def upload_image(file: UploadFile = File(...)):
     """Handle image upload and return base64 encoding."""
     
     # Validate file type
-    allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}"
+            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_IMAGE_TYPES)}"
         )
     
-    # Check file size (max 10MB)
-    content = await file.read()
-    if len(content) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File too large. Max size: 10MB")
-    
-    # Encode to base64
-    base64_data = base64.b64encode(content).decode("utf-8")
+    # Encode to base64 while reading, checking the size limit (max 10MB) as we go
+    base64_data = await read_base64(file, UPLOAD_MAX_BYTES)
     
     return {
         "success": True,
@@ -587,20 +1083,18 @@ async def transcribe_audio(file: UploadFile = File(...)):
 async def get_history(session_id: str):
     """Get chat history for a session."""
     
-    if session_id not in sessions:
-        return {"session_id": session_id, "messages": []}
-    
     return {
         "session_id": session_id,
-        "messages": sessions[session_id]
+        "messages": list(await load_history(session_id))
     }
 
 @app.delete("/history/{session_id}")
 async def clear_history(session_id: str):
     """Clear chat history for a session."""
     
-    if session_id in sessions:
-        del sessions[session_id]
+    # The transcript stays stored; the cutoff keeps it from being reloaded as context
+    await asyncio.to_thread(db.clear_history, session_id)
+    sessions[session_id] = deque(maxlen=SESSION_HISTORY_LIMIT)
     
     return {"success": True, "message": "History cleared"}
 
@@ -608,8 +1102,7 @@ async def clear_history(session_id: str):
 async def health_check():
     """Detailed health check."""
     return {
-        "status": "healthy",
-        "api_key_configured": bool(OPENROUTER_API_KEY),
+        **HEALTH_STATIC,
         "active_sessions": len(sessions),
         "timestamp": datetime.now().isoformat()
     }
@@ -620,14 +1113,14 @@ async def health_check():
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": True, "detail": exc.detail}
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": True, "detail": "An unexpected error occurred"}
     )
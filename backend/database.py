@@ -7,84 +7,243 @@ import sqlite3
 import json
 import os
 import uuid
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), "chatbot.db")
 
 
-def get_connection():
-    """Get database connection."""
-    conn = sqlite3.connect(DATABASE_PATH)
+# One long-lived connection shared by every request thread, guarded by _lock
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.RLock()
+
+# Per-thread read-only connections, so hot reads don't queue behind _lock
+_local = threading.local()
+_read_conns: List[sqlite3.Connection] = []
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, cached_statements=512)
     conn.row_factory = sqlite3.Row
+    # WAL: readers don't block the writer, and commits skip most fsyncs
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+    return conn
+
+
+def get_connection():
+    """Get the shared database connection (use locked_connection to access it)."""
+    global _conn
+    if _conn is None:
+        _conn = _connect()
+    return _conn
+
+
+def get_read_connection():
+    """Get this thread's read connection, opened once and then reused."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
+        with _lock:
+            _read_conns.append(conn)
     return conn
 
 
+def close_connection():
+    """Close the read connections, then checkpoint the WAL and close the shared connection."""
+    global _conn
+    with _lock:
+        for conn in _read_conns:
+            conn.close()
+        _read_conns.clear()
+        _local.__dict__.clear()
+        if _conn is None:
+            return
+        _conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        _conn.close()
+        _conn = None
+
+
+@contextmanager
+def locked_connection():
+    """Hold the shared connection for one unit of work; rolls back on error."""
+    with _lock:
+        conn = get_connection()
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+# Bump whenever init_database changes, so existing databases pick up the new DDL
+SCHEMA_VERSION = 7
+
+
 def init_database():
     """Initialize database tables."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Sessions table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            id TEXT PRIMARY KEY,
-            title TEXT DEFAULT 'New Chat',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            model TEXT DEFAULT 'nvidia/nemotron-3-nano-30b-a3b:free',
-            is_active INTEGER DEFAULT 1
-        )
-    """)
-    
-    # Messages table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT NOT NULL,
-            role TEXT NOT NULL,
-            content TEXT NOT NULL,
-            reasoning TEXT,
-            image_url TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (session_id) REFERENCES sessions(id)
-        )
-    """)
-    
-    # Settings table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS settings (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Stats table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS stats (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT NOT NULL,
-            total_messages INTEGER DEFAULT 0,
-            total_sessions INTEGER DEFAULT 0,
-            UNIQUE(date)
-        )
-    """)
-    
-    # Users table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id TEXT PRIMARY KEY,
-            email TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            name TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP
-        )
-    """)
-    
-    conn.commit()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Already at this schema - skip the DDL (every import and worker lands here)
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return
+        
+        # Sessions table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                title TEXT DEFAULT 'New Chat',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                model TEXT DEFAULT 'nvidia/nemotron-3-nano-30b-a3b:free',
+                is_active INTEGER DEFAULT 1,
+                history_cutoff INTEGER DEFAULT 0
+            )
+        """)
+        # Older databases predate history_cutoff
+        cursor.execute("PRAGMA table_info(sessions)")
+        if "history_cutoff" not in [row["name"] for row in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE sessions ADD COLUMN history_cutoff INTEGER DEFAULT 0")
+        
+        # Messages table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                reasoning TEXT,
+                image_url TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (session_id) REFERENCES sessions(id)
+            )
+        """)
+        
+        # Per-session message lookups and the recent-sessions listing
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_msgs_sess_time ON messages(session_id, created_at)")
+        # id is the tie-breaker of the session listing's ORDER BY
+        cursor.execute("DROP INDEX IF EXISTS idx_sessions_updated")
+        cursor.execute("CREATE INDEX idx_sessions_updated ON sessions(is_active, updated_at DESC, id)")
+        # Daily counts now come from message_daily_counts below
+        cursor.execute("DROP INDEX IF EXISTS idx_messages_day")
+        cursor.execute("DROP INDEX IF EXISTS idx_messages_daysub")
+        
+        # Messages per day, kept current by triggers so get_stats never aggregates messages
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS message_daily_counts (
+                day TEXT PRIMARY KEY,
+                cnt INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_msg_ins AFTER INSERT ON messages BEGIN
+                INSERT INTO message_daily_counts (day, cnt)
+                VALUES (substr(NEW.created_at, 1, 10), 1)
+                ON CONFLICT(day) DO UPDATE SET cnt = cnt + 1;
+            END
+        """)
+        # Days left with no messages are dropped, as the old GROUP BY never returned them
+        cursor.execute("DROP TRIGGER IF EXISTS trg_msg_del")
+        cursor.execute("""
+            CREATE TRIGGER trg_msg_del AFTER DELETE ON messages BEGIN
+                UPDATE message_daily_counts SET cnt = cnt - 1
+                WHERE day = substr(OLD.created_at, 1, 10);
+                DELETE FROM message_daily_counts
+                WHERE day = substr(OLD.created_at, 1, 10) AND cnt <= 0;
+            END
+        """)
+        # (Re)build the rollup from the messages already stored
+        cursor.execute("DELETE FROM message_daily_counts")
+        cursor.execute("""
+            INSERT INTO message_daily_counts (day, cnt)
+            SELECT substr(created_at, 1, 10), COUNT(*) FROM messages
+            GROUP BY substr(created_at, 1, 10)
+        """)
+        
+        # Running totals for get_stats, kept current by triggers like the daily counts
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stats_counters (
+                key TEXT PRIMARY KEY,
+                val INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_count_msg_ins AFTER INSERT ON messages BEGIN
+                UPDATE stats_counters SET val = val + 1 WHERE key = 'messages_total';
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_count_msg_del AFTER DELETE ON messages BEGIN
+                UPDATE stats_counters SET val = val - 1 WHERE key = 'messages_total';
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_count_sess_ins AFTER INSERT ON sessions BEGIN
+                UPDATE stats_counters SET val = val + IFNULL(NEW.is_active = 1, 0)
+                WHERE key = 'sessions_active';
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_count_sess_upd AFTER UPDATE OF is_active ON sessions BEGIN
+                UPDATE stats_counters
+                SET val = val + IFNULL(NEW.is_active = 1, 0) - IFNULL(OLD.is_active = 1, 0)
+                WHERE key = 'sessions_active';
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_count_sess_del AFTER DELETE ON sessions BEGIN
+                UPDATE stats_counters SET val = val - IFNULL(OLD.is_active = 1, 0)
+                WHERE key = 'sessions_active';
+            END
+        """)
+        # (Re)seed the totals from the rows already stored
+        cursor.execute("""
+            INSERT OR REPLACE INTO stats_counters (key, val) VALUES
+                ('sessions_active', (SELECT COUNT(*) FROM sessions WHERE is_active = 1)),
+                ('messages_total', (SELECT COUNT(*) FROM messages))
+        """)
+        
+        # Settings table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Stats table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                total_messages INTEGER DEFAULT 0,
+                total_sessions INTEGER DEFAULT 0,
+                UNIQUE(date)
+            )
+        """)
+        
+        # Users table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id TEXT PRIMARY KEY,
+                email TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                name TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_login TIMESTAMP
+            )
+        """)
+        
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
     print("Database initialized successfully!")
 
 
@@ -94,63 +253,57 @@ def init_database():
 
 def create_user(email: str, password_hash: str, name: str = "User") -> Dict:
     """Create a new user."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    user_id = str(uuid.uuid4())
-    
-    try:
-        cursor.execute("""
-            INSERT INTO users (id, email, password, name, created_at)
-            VALUES (?, ?, ?, ?, datetime('now'))
-        """, (user_id, email, password_hash, name))
-        conn.commit()
-        return {"id": user_id, "email": email, "name": name}
-    except sqlite3.IntegrityError:
-        return None  # Email exists
-    finally:
-        conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        user_id = str(uuid.uuid4())
+        
+        try:
+            cursor.execute("""
+                INSERT INTO users (id, email, password, name, created_at)
+                VALUES (?, ?, ?, ?, datetime('now'))
+            """, (user_id, email, password_hash, name))
+            conn.commit()
+            return {"id": user_id, "email": email, "name": name}
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            return None  # Email exists
 
 def get_user_by_email(email: str) -> Optional[Dict]:
     """Get user by email."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
-    row = cursor.fetchone()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            "SELECT id, email, password, name, created_at, last_login FROM users WHERE email = ?",
+            (email,)
+        )
+        row = cursor.fetchone()
     
     if row:
         return dict(row)
     return None
 
-def verify_user(email: str, password_hash: str) -> Optional[Dict]:
-    """Verify user credentials."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM users WHERE email = ? AND password = ?
-    """, (email, password_hash))
-    row = cursor.fetchone()
-    
-    if row:
-        # Update last login
-        cursor.execute("UPDATE users SET last_login = datetime('now') WHERE id = ?", (row['id'],))
+def update_user_password(user_id: str, password_hash: str):
+    """Replace a user's stored password hash."""
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE users SET password = ? WHERE id = ?", (password_hash, user_id))
+        conn.commit()
+
+def record_login(user_id: str):
+    """Update a user's last login time."""
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE users SET last_login = datetime('now') WHERE id = ?", (user_id,))
         conn.commit()
-        conn.close()
-        return dict(row)
-    
-    conn.close()
-    return None
 
 def get_all_users() -> List[Dict]:
     """Get all users for admin panel."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, email, name, created_at, last_login FROM users ORDER BY created_at DESC")
-    rows = cursor.fetchall()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, email, name, created_at, last_login FROM users ORDER BY created_at DESC")
+        rows = cursor.fetchall()
     return [dict(row) for row in rows]
 
 # =============================================================================
@@ -159,93 +312,113 @@ def get_all_users() -> List[Dict]:
 
 def create_session(session_id: str, title: str = "New Chat") -> Dict:
     """Create a new chat session."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO sessions (id, title, created_at, updated_at)
-        VALUES (?, ?, datetime('now'), datetime('now'))
-    """, (session_id, title))
-    
-    conn.commit()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT INTO sessions (id, title, created_at, updated_at)
+            VALUES (?, ?, datetime('now'), datetime('now'))
+        """, (session_id, title))
+        
+        conn.commit()
+        _invalidate_stats()
     
     return {"id": session_id, "title": title}
 
 
 def get_session(session_id: str) -> Optional[Dict]:
     """Get session by ID."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM sessions WHERE id = ?", (session_id,))
-    row = cursor.fetchone()
-    
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            "SELECT id, title, created_at, updated_at, model, is_active FROM sessions WHERE id = ?",
+            (session_id,)
+        )
+        row = cursor.fetchone()
     
     if row:
         return dict(row)
     return None
 
 
-def get_all_sessions(limit: int = 50) -> List[Dict]:
+def get_all_sessions(limit: int = 50, offset: int = 0) -> List[Dict]:
     """Get all sessions, ordered by most recent."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT s.*, 
-               (SELECT COUNT(*) FROM messages WHERE session_id = s.id) as message_count,
-               (SELECT content FROM messages WHERE session_id = s.id ORDER BY created_at LIMIT 1) as first_message
-        FROM sessions s
-        WHERE s.is_active = 1
-        ORDER BY s.updated_at DESC
-        LIMIT ?
-    """, (limit,))
-    
-    rows = cursor.fetchall()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Page the sessions first, then aggregate their messages in one join.
+        # updated_at has one-second resolution, so id breaks ties to keep
+        # pages from overlapping.
+        # With a single MIN() in the query, SQLite takes the bare content column
+        # from that row - i.e. the first message.
+        cursor.execute("""
+            SELECT id, title, created_at, updated_at, model, is_active,
+                   message_count, first_message
+            FROM (
+                SELECT p.id, p.title, p.created_at, p.updated_at, p.model, p.is_active,
+                       COUNT(m.id) as message_count,
+                       m.content as first_message, MIN(m.created_at)
+                FROM (
+                    SELECT id, title, created_at, updated_at, model, is_active FROM sessions
+                    WHERE is_active = 1
+                    ORDER BY updated_at DESC, id
+                    LIMIT ? OFFSET ?
+                ) p
+                LEFT JOIN messages m ON m.session_id = p.id
+                GROUP BY p.id
+            )
+            ORDER BY updated_at DESC, id
+        """, (limit, offset))
+        
+        rows = cursor.fetchall()
     
     return [dict(row) for row in rows]
 
 
 def update_session_title(session_id: str, title: str):
     """Update session title."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        UPDATE sessions 
-        SET title = ?, updated_at = datetime('now')
-        WHERE id = ?
-    """, (title, session_id))
-    
-    conn.commit()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE sessions 
+            SET title = ?, updated_at = datetime('now')
+            WHERE id = ?
+        """, (title, session_id))
+        
+        conn.commit()
 
 
 def delete_session(session_id: str):
     """Soft delete a session."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        UPDATE sessions SET is_active = 0 WHERE id = ?
-    """, (session_id,))
-    
-    conn.commit()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Messages stay stored; the cutoff keeps them out of the model context
+        # if the session id is used again
+        cursor.execute("""
+            UPDATE sessions
+            SET is_active = 0, history_cutoff = (SELECT IFNULL(MAX(id), 0) FROM messages)
+            WHERE id = ?
+        """, (session_id,))
+        
+        conn.commit()
+        _invalidate_stats()
 
 
 def delete_all_sessions():
     """Delete all sessions."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("UPDATE sessions SET is_active = 0")
-    
-    conn.commit()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE sessions
+            SET is_active = 0, history_cutoff = (SELECT IFNULL(MAX(id), 0) FROM messages)
+        """)
+        
+        conn.commit()
+        _invalidate_stats()
 
 
 # =============================================================================
@@ -255,73 +428,139 @@ def delete_all_sessions():
 def add_message(session_id: str, role: str, content: str, 
                 reasoning: str = None, image_url: str = None) -> Dict:
     """Add a message to a session."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Create session if it doesn't exist
-    cursor.execute("SELECT id FROM sessions WHERE id = ?", (session_id,))
-    if not cursor.fetchone():
-        create_session(session_id)
-    
-    cursor.execute("""
-        INSERT INTO messages (session_id, role, content, reasoning, image_url)
-        VALUES (?, ?, ?, ?, ?)
-    """, (session_id, role, content, reasoning, image_url))
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Create session if it doesn't exist
+        cursor.execute("SELECT id FROM sessions WHERE id = ?", (session_id,))
+        if not cursor.fetchone():
+            create_session(session_id)
+        
+        cursor.execute("""
+            INSERT INTO messages (session_id, role, content, reasoning, image_url)
+            VALUES (?, ?, ?, ?, ?)
+        """, (session_id, role, content, reasoning, image_url))
+        
+        message_id = cursor.lastrowid
+        
+        # Update session timestamp and title (use first user message as title)
+        if role == "user":
+            cursor.execute("""
+                UPDATE sessions 
+                SET updated_at = datetime('now'),
+                    is_active = 1,
+                    title = CASE 
+                        WHEN title = 'New Chat' THEN substr(?, 1, 50)
+                        ELSE title
+                    END
+                WHERE id = ?
+            """, (content, session_id))
+        else:
+            cursor.execute("""
+                UPDATE sessions SET updated_at = datetime('now'), is_active = 1 WHERE id = ?
+            """, (session_id,))
+        
+        conn.commit()
+        _invalidate_stats()
     
-    message_id = cursor.lastrowid
+    return {"id": message_id, "session_id": session_id, "role": role, "content": content}
+
+
+def add_messages(session_id: str, rows: List[tuple]):
+    """Add several (role, content, reasoning, image_url) messages in one transaction."""
+    first_user = next((row[1] for row in rows if row[0] == "user"), None)
     
-    # Update session timestamp and title (use first user message as title)
-    if role == "user":
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Create session if it doesn't exist
+        cursor.execute("""
+            INSERT OR IGNORE INTO sessions (id, title, created_at, updated_at)
+            VALUES (?, 'New Chat', datetime('now'), datetime('now'))
+        """, (session_id,))
+        
+        cursor.executemany("""
+            INSERT INTO messages (session_id, role, content, reasoning, image_url)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(session_id, *row) for row in rows])
+        
+        # One timestamp/title update for the whole batch (first user message as title).
+        # A soft-deleted session that is written to again becomes active again.
         cursor.execute("""
             UPDATE sessions 
             SET updated_at = datetime('now'),
+                is_active = 1,
                 title = CASE 
-                    WHEN title = 'New Chat' THEN substr(?, 1, 50)
+                    WHEN title = 'New Chat' AND ? IS NOT NULL THEN substr(?, 1, 50)
                     ELSE title
                 END
             WHERE id = ?
-        """, (content, session_id))
-    else:
-        cursor.execute("""
-            UPDATE sessions SET updated_at = datetime('now') WHERE id = ?
-        """, (session_id,))
-    
-    conn.commit()
-    conn.close()
-    
-    return {"id": message_id, "session_id": session_id, "role": role, "content": content}
+        """, (first_user, first_user, session_id))
+        
+        conn.commit()
+        _invalidate_stats()
 
 
 def get_messages(session_id: str, limit: int = 100) -> List[Dict]:
     """Get all messages for a session."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM messages 
-        WHERE session_id = ?
-        ORDER BY created_at ASC
-        LIMIT ?
-    """, (session_id, limit))
-    
-    rows = cursor.fetchall()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT id, session_id, role, content, reasoning, image_url, created_at
+            FROM messages
+            WHERE session_id = ?
+            ORDER BY created_at ASC
+            LIMIT ?
+        """, (session_id, limit))
+        
+        rows = cursor.fetchall()
     
     return [dict(row) for row in rows]
 
 
+def get_recent_messages(session_id: str, limit: int = 50) -> List[Dict]:
+    """Get the latest messages for a session after its history cutoff, oldest first."""
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT role, content FROM messages
+            WHERE session_id = ?
+              AND id > IFNULL((SELECT history_cutoff FROM sessions WHERE id = ?), 0)
+            ORDER BY id DESC
+            LIMIT ?
+        """, (session_id, session_id, limit))
+        
+        rows = cursor.fetchall()
+    
+    return [dict(row) for row in reversed(rows)]
+
+
+def clear_history(session_id: str):
+    """Hide a session's stored messages from its model context (they stay in the transcript)."""
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE sessions SET history_cutoff = (SELECT IFNULL(MAX(id), 0) FROM messages)
+            WHERE id = ?
+        """, (session_id,))
+        
+        conn.commit()
+
+
 def get_message_count(session_id: str = None) -> int:
     """Get total message count."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if session_id:
-        cursor.execute("SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,))
-    else:
-        cursor.execute("SELECT COUNT(*) FROM messages")
-    
-    count = cursor.fetchone()[0]
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        if session_id:
+            cursor.execute("SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,))
+        else:
+            cursor.execute("SELECT COUNT(*) FROM messages")
+        
+        (count,) = cursor.fetchone()
     
     return count
 
@@ -332,13 +571,11 @@ def get_message_count(session_id: str = None) -> int:
 
 def get_setting(key: str, default: Any = None) -> Any:
     """Get a setting value."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-    row = cursor.fetchone()
-    
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
+        row = cursor.fetchone()
     
     if row:
         try:
@@ -350,51 +587,70 @@ def get_setting(key: str, default: Any = None) -> Any:
 
 def set_setting(key: str, value: Any):
     """Set a setting value."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    value_str = json.dumps(value) if not isinstance(value, str) else value
-    
-    cursor.execute("""
-        INSERT OR REPLACE INTO settings (key, value, updated_at)
-        VALUES (?, ?, datetime('now'))
-    """, (key, value_str))
-    
-    conn.commit()
-    conn.close()
+    with locked_connection() as conn:
+        cursor = conn.cursor()
+        
+        value_str = json.dumps(value) if not isinstance(value, str) else value
+        
+        cursor.execute("""
+            INSERT OR REPLACE INTO settings (key, value, updated_at)
+            VALUES (?, ?, datetime('now'))
+        """, (key, value_str))
+        
+        conn.commit()
 
 
 # =============================================================================
 # Stats Functions
 # =============================================================================
 
+# Module constants, so every call passes the same SQL and reuses the
+# connection's prepared statement instead of parsing and planning again
+TOTALS_SQL = """
+    SELECT (SELECT val FROM stats_counters WHERE key = 'sessions_active'),
+           (SELECT val FROM stats_counters WHERE key = 'messages_total')
+"""
+DAILY_MSG_SQL = """
+    SELECT day, cnt FROM message_daily_counts
+    WHERE day >= date('now', '-6 days')
+    ORDER BY day DESC
+"""
+
+# Dashboards poll get_stats, so its result is reused for STATS_CACHE_TTL seconds.
+# Writes that change the counts reset it, so a cached result is never stale.
+STATS_CACHE_TTL = 10
+_stats_cache = {"t": 0.0, "v": None, "gen": 0}
+
+def _invalidate_stats():
+    _stats_cache["t"] = 0.0
+    _stats_cache["gen"] += 1
+
 def get_stats() -> Dict:
     """Get overall statistics."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT COUNT(*) FROM sessions WHERE is_active = 1")
-    total_sessions = cursor.fetchone()[0]
+    if _stats_cache["v"] is not None and time.monotonic() - _stats_cache["t"] < STATS_CACHE_TTL:
+        return _stats_cache["v"]
     
-    cursor.execute("SELECT COUNT(*) FROM messages")
-    total_messages = cursor.fetchone()[0]
+    # Read on this thread's own connection; a write landing meanwhile bumps
+    # "gen", and then this result is returned but not cached
+    gen = _stats_cache["gen"]
+    conn = get_read_connection()
     
-    cursor.execute("""
-        SELECT date(created_at) as day, COUNT(*) as count 
-        FROM messages 
-        GROUP BY date(created_at)
-        ORDER BY day DESC
-        LIMIT 7
-    """)
-    daily_messages = [dict(row) for row in cursor.fetchall()]
+    # Both counts in one statement - one execute/fetch round trip instead of two
+    total_sessions, total_messages = conn.execute(TOTALS_SQL).fetchone()
     
-    conn.close()
+    daily_messages = [{"day": day, "count": count} for day, count in conn.execute(DAILY_MSG_SQL)]
     
-    return {
+    stats = {
         "total_sessions": total_sessions,
         "total_messages": total_messages,
         "daily_messages": daily_messages
     }
+    with _lock:
+        if _stats_cache["gen"] == gen:
+            _stats_cache["v"] = stats
+            _stats_cache["t"] = time.monotonic()
+    
+    return stats
 
 
 # Initialize database on import
@@ -10,7 +10,8 @@
 const CONFIG = {
     apiEndpoint: localStorage.getItem('apiEndpoint') || 'http://localhost:8000',
     model: localStorage.getItem('model') || 'deepseek/deepseek-chat',
-    temperature: parseFloat(localStorage.getItem('temperature')) || 0.7,
+    // A saved temperature of 0 is valid, so only fall back when none is saved
+    temperature: localStorage.getItem('temperature') === null ? 0.7 : parseFloat(localStorage.getItem('temperature')),
     voiceOutput: localStorage.getItem('voiceOutput') === 'true',
     theme: localStorage.getItem('theme') || 'dark'
 };
@@ -26,8 +27,8 @@ const STATE = {
     isRecording: false,
     mediaRecorder: null,
     audioChunks: [],
-    currentImage: null,
-    imageType: null,
+    currentImage: null,  // File, posted as-is to /chat/image
+    imageUrl: null,      // data URL for the preview and the chat bubble
     isProcessing: false,
     messages: []
 };
@@ -290,18 +291,74 @@ window.toggleReasoning = toggleReasoning;
 // API Communication
 // =============================================================================
 
-async function sendMessage(message, imageData = null, imageType = null) {
+// Read /chat/stream, showing the answer as it arrives; resolves with the 'done' event
+async function streamMessage(message) {
+    const response = await fetch(`${CONFIG.apiEndpoint}/chat/stream`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+            message: message,
+            session_id: STATE.sessionId,
+            model: CONFIG.model,
+            temperature: CONFIG.temperature
+        })
+    });
+
+    if (!response.ok) {
+        const error = await response.json();
+        throw new Error(error.detail || 'Failed to get response');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let answer = '';
+    let liveMessage = null;
+
+    try {
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            for (const event of events) {
+                if (!event.startsWith('data: ')) continue;
+                const data = JSON.parse(event.slice(6));
+                if (data.type === 'content') {
+                    if (!liveMessage) {
+                        removeTypingIndicator();
+                        liveMessage = createMessageElement('bot', '');
+                        elements.messagesContainer.appendChild(liveMessage);
+                    }
+                    answer += data.content;
+                    liveMessage.querySelector('.message-bubble').innerHTML = formatMessageContent(answer);
+                    elements.messagesContainer.scrollTop = elements.messagesContainer.scrollHeight;
+                } else if (data.type === 'error') {
+                    throw new Error(data.detail);
+                } else if (data.type === 'done') {
+                    return data;
+                }
+            }
+        }
+    } finally {
+        // The finished answer is added through addMessage like a /chat reply
+        if (liveMessage) {
+            liveMessage.remove();
+        }
+    }
+
+    throw new Error('The response stream ended early');
+}
+
+async function sendMessage(message, imageFile = null, imageUrl = null) {
     if (STATE.isProcessing) return;
 
     STATE.isProcessing = true;
     elements.sendBtn.disabled = true;
 
-    // Create image URL for display
-    let imageUrl = null;
-    if (imageData) {
-        imageUrl = `data:${imageType};base64,${imageData}`;
-    }
-
     // Add user message
     addMessage('user', message, null, imageUrl);
 
@@ -314,27 +371,30 @@ async function sendMessage(message, imageData = null, imageType = null) {
     showTypingIndicator();
 
     try {
-        const response = await fetch(`${CONFIG.apiEndpoint}/chat`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                message: message,
-                session_id: STATE.sessionId,
-                model: CONFIG.model,
-                temperature: CONFIG.temperature,
-                image_data: imageData,
-                image_type: imageType
-            })
-        });
+        let data;
+        if (imageFile) {
+            // Send the image file with the message in one multipart request
+            const form = new FormData();
+            form.append('file', imageFile);
+            form.append('message', message);
+            form.append('session_id', STATE.sessionId);
+            form.append('model', CONFIG.model);
+            form.append('temperature', CONFIG.temperature);
+            const response = await fetch(`${CONFIG.apiEndpoint}/chat/image`, {
+                method: 'POST',
+                body: form
+            });
 
-        if (!response.ok) {
-            const error = await response.json();
-            throw new Error(error.detail || 'Failed to get response');
-        }
+            if (!response.ok) {
+                const error = await response.json();
+                throw new Error(error.detail || 'Failed to get response');
+            }
 
-        const data = await response.json();
+            data = await response.json();
+        } else {
+            // Text messages stream so the answer shows as soon as it starts
+            data = await streamMessage(message);
+        }
 
         // Remove typing indicator
         removeTypingIndicator();
@@ -523,11 +583,11 @@ function handleImageUpload(file) {
         return;
     }
 
+    STATE.currentImage = file;
+
     const reader = new FileReader();
     reader.onload = (e) => {
-        const base64 = e.target.result.split(',')[1];
-        STATE.currentImage = base64;
-        STATE.imageType = file.type;
+        STATE.imageUrl = e.target.result;
 
         elements.previewImg.src = e.target.result;
         elements.imagePreview.style.display = 'block';
@@ -537,7 +597,7 @@ function handleImageUpload(file) {
 
 function clearImagePreview() {
     STATE.currentImage = null;
-    STATE.imageType = null;
+    STATE.imageUrl = null;
     elements.imagePreview.style.display = 'none';
     elements.previewImg.src = '';
     elements.imageInput.value = '';
@@ -650,7 +710,7 @@ elements.sendBtn.addEventListener('click', () => {
         sendMessage(
             message || 'What is in this image?',
             STATE.currentImage,
-            STATE.imageType
+            STATE.imageUrl
         );
     }
 });